@@ -0,0 +1,54 @@
+import random
+
+DATASET_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+TITLES = [
+    "Software Engineer", "Senior Python Developer", "Data Engineer", "Data Scientist",
+    "Machine Learning Engineer", "Backend Engineer", "Frontend Engineer", "DevOps Engineer",
+    "Site Reliability Engineer", "Product Manager", "QA Engineer", "Platform Engineer",
+]
+SENIORITY = ["", "Junior ", "Senior ", "Staff ", "Lead "]
+COMPANIES = [f"Company {i}" for i in range(500)]
+LOCATIONS = [
+    "New York, NY", "San Francisco, CA", "Austin, TX", "Remote", "Seattle, WA",
+    "Boston, MA", "Chicago, IL", "Denver, CO", "London, UK", "Berlin, Germany",
+]
+SOURCES = ["linkedin", "indeed", "glassdoor"]
+STATUSES = ["discovered", "discovered", "discovered", "applied", "interview", "rejected", "offer"]
+SKILLS = [
+    "Python", "SQL", "AWS", "Docker", "Kubernetes", "React", "TypeScript", "Java",
+    "Go", "Spark", "Airflow", "PostgreSQL", "Terraform", "Pandas", "FastAPI", "Django",
+]
+SENTENCES = [
+    "You will design and build scalable backend services.",
+    "Collaborate with product and design to ship new features.",
+    "Experience with cloud infrastructure is required.",
+    "Strong communication skills and ownership mindset.",
+    "Maintain data pipelines and improve their reliability.",
+    "Mentor other engineers and review their code.",
+    "We offer competitive salary, equity and flexible remote work.",
+    "Familiarity with CI/CD and automated testing.",
+]
+
+
+def synthetic_jobs(count, users=100, seed=42, description_sentences=6):
+    """
+    Yield `count` synthetic job dicts shaped like BrowserController output,
+    with a few extra columns (user_id, status, skills) for database benchmarks.
+    Generation is lazy so 1M-row datasets never sit in memory.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        title = rng.choice(SENIORITY) + rng.choice(TITLES)
+        source = rng.choice(SOURCES)
+        yield {
+            "user_id": 1 + (i % users),
+            "title": title,
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "url": f"https://www.{source}.com/jobs/view/{i}",
+            "source": source,
+            "status": rng.choice(STATUSES),
+            "description": " ".join(rng.choice(SENTENCES) for _ in range(description_sentences)),
+            "skills": rng.sample(SKILLS, 4),
+        }
@@ -0,0 +1,82 @@
+import json
+import time
+import random
+
+
+class FakeUsageMetadata:
+    """Mimics the usage metadata attached to Gemini responses."""
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class FakeResponse:
+    """Mimics a google.generativeai GenerateContentResponse."""
+    def __init__(self, text, prompt_tokens):
+        self.text = text
+        self.usage_metadata = FakeUsageMetadata(prompt_tokens, len(text) // 4)
+
+
+SKILLS_RESPONSE = {
+    "required": [
+        {"skill": "Python", "relevance": 10},
+        {"skill": "SQL", "relevance": 8},
+        {"skill": "REST APIs", "relevance": 7},
+    ],
+    "preferred": [
+        {"skill": "Docker", "relevance": 6},
+        {"skill": "AWS", "relevance": 5},
+    ],
+}
+
+MATCH_RESPONSE = {
+    "match_percentage": 72,
+    "matching_skills": [{"skill": "Python", "importance": "high"}],
+    "missing_skills": [{"skill": "AWS", "importance": "medium"}],
+    "job_summary": "Backend role building Python data services.",
+}
+
+TIPS_RESPONSE = {
+    "resume_tips": ["Lead with Python backend experience."],
+    "cover_letter_tips": ["Mention data pipeline ownership."],
+    "interview_preparation": ["Review SQL query optimisation."],
+}
+
+MARKET_RESPONSE = {
+    "market_summary": "Demand for backend engineers remains steady.",
+    "trends": ["Remote roles are common."],
+    "in_demand_skills": [{"skill": "Python", "demand": "high"}],
+    "salary_insights": "Not available.",
+}
+
+
+class FakeGeminiModel:
+    """
+    Stand-in for genai.GenerativeModel with configurable latency.
+    Responses are chosen from the prompt wording used by AIProcessor.
+    """
+    def __init__(self, latency=0.05, jitter=0.0, fenced=True, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.fenced = fenced
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def _payload_for(self, prompt):
+        if "Extract skills" in prompt:
+            return SKILLS_RESPONSE
+        if "match percentage" in prompt:
+            return MATCH_RESPONSE
+        if "application tips" in prompt:
+            return TIPS_RESPONSE
+        return MARKET_RESPONSE
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        text = json.dumps(self._payload_for(prompt))
+        if self.fenced:
+            text = f"```json\n{text}\n```"
+        return FakeResponse(text, len(prompt) // 4)
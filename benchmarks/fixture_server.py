@@ -0,0 +1,107 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Sub-resources referenced by the fixture pages, served as dummy payloads so
+# the browser has realistic bytes to download (path -> (content type, size)).
+# Third-party hosts are embedded in the path so BLOCKED_URL_PATTERNS match them.
+STATIC_ASSETS = {
+    "/static/site.css": ("text/css", 8 * 1024),
+    "/static/font.woff2": ("font/woff2", 48 * 1024),
+    "/static/www.google-analytics.com/analytics.js": ("application/javascript", 64 * 1024),
+    "/static/securepubads.g.doubleclick.net/tag/js/gpt.js": ("application/javascript", 96 * 1024),
+    "/static/logo.png": ("image/png", 12 * 1024),
+    "/static/hero.jpg": ("image/jpeg", 240 * 1024),
+}
+COMPANY_LOGO_SIZE = 16 * 1024
+
+
+def load_fixture(name):
+    """Return the contents of a saved HTML fixture."""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureServer:
+    """
+    Serves the saved job-site fixtures over local HTTP.
+
+    /search/<site_key>        -> fixtures/<site_key>.html
+    /job/<site_key>/<n>       -> fixtures/job_detail.html
+    /static/...               -> dummy images, fonts and scripts
+    """
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+        self._pages = {}
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def search_url_template(self, site_key):
+        """URL template usable in place of JOB_SITES[site_key]["url"]."""
+        return f"{self.base_url}/search/{site_key}?q={{query}}&l={{location}}"
+
+    def _load_pages(self):
+        for name in os.listdir(FIXTURES_DIR):
+            if name.endswith(".html"):
+                self._pages[name[:-5]] = load_fixture(name).encode("utf-8")
+
+    def _resolve(self, path):
+        path = path.split("?", 1)[0]
+        if path.startswith("/search/"):
+            page = self._pages.get(path[len("/search/"):])
+            return ("text/html; charset=utf-8", page) if page is not None else None
+        if path.startswith("/job/"):
+            return "text/html; charset=utf-8", self._pages["job_detail"]
+        if path in STATIC_ASSETS:
+            content_type, size = STATIC_ASSETS[path]
+            return content_type, b"\0" * size
+        if path.startswith("/static/company-"):
+            return "image/png", b"\0" * COMPANY_LOGO_SIZE
+        return None
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._load_pages()
+        fixture_server = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                resolved = fixture_server._resolve(self.path)
+                if resolved is None:
+                    self.send_error(404)
+                    return
+                content_type, body = resolved
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), FixtureHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
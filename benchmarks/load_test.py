@@ -0,0 +1,233 @@
+"""
+Load test for the HTTP API in src/api.py.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test                              # in-process server on a seeded temp DB
+    python -m benchmarks.load_test --concurrency 64 --duration 30
+    python -m benchmarks.load_test --db-pool-size 0 --cache-ttl 0   # baseline: no pool, no read cache
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --users 100
+
+Each worker thread keeps one HTTP/1.1 connection open and issues a weighted
+mix of read and write requests. Reports overall and per-endpoint req/s and
+latency percentiles, and writes them to benchmarks/results/load-<timestamp>-<commit>.json.
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import http.client
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from benchmarks.datasets import synthetic_jobs
+
+# (name, weight, method, path template, body)
+REQUEST_MIX = [
+    ("list_jobs", 50, "GET", "/users/{user_id}/jobs?limit=20", None),
+    ("list_jobs_status", 10, "GET", "/users/{user_id}/jobs?status=applied&limit=20", None),
+    ("funnel", 20, "GET", "/users/{user_id}/funnel", None),
+    ("job_skills", 10, "GET", "/jobs/{job_id}/skills", None),
+    ("update_status", 8, "PATCH", "/jobs/{job_id}/status", {"status": "applied"}),
+    ("add_job", 2, "POST", "/users/{user_id}/jobs", {"title": "Load Test Engineer", "company": "Load Co"}),
+]
+
+
+def seed_database(db_path, users, jobs_per_user):
+    """
+    Create users and jobs (with skills) through Database, so the status
+    history and the funnel/summary tables are filled as in production.
+    Returns the job id range.
+    """
+    from src.database import Database
+    from src.models import JobSkill
+
+    # A one-connection pool keeps the file in WAL mode, which makes seeding fast
+    database = Database(db_path, pool_size=1)
+    for i in range(users):
+        database.add_user(f"load{i}", f"load{i}@example.com", "hash")
+
+    job_ids = []
+    for job in synthetic_jobs(users * jobs_per_user, users=users):
+        job_id = database.add_job(job["user_id"], job["title"], job["company"], job["location"],
+                                  job["description"], job["url"], job["source"], dedup=False)
+        database.add_job_skills(job_id, [JobSkill("Python", True), JobSkill("SQL", True)])
+        if job["status"] != "discovered":
+            database.update_job_status(job_id, job["status"])
+        job_ids.append(job_id)
+    database.close()
+    return min(job_ids), max(job_ids)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    """Run the API with uvicorn in a background thread."""
+    import uvicorn
+    from src.api import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline or not thread.is_alive():
+            raise RuntimeError("API server did not start")
+        time.sleep(0.05)
+    return server, thread
+
+
+def worker(base_url, users, job_ids, stop_at, seed, samples, errors):
+    """Issue requests over one keep-alive connection until stop_at."""
+    rng = random.Random(seed)
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    names = [entry[0] for entry in REQUEST_MIX]
+    weights = [entry[1] for entry in REQUEST_MIX]
+    mix = {entry[0]: entry for entry in REQUEST_MIX}
+
+    while time.perf_counter() < stop_at:
+        name, _, method, template, body = mix[rng.choices(names, weights)[0]]
+        path = template.format(user_id=rng.randint(1, users), job_id=rng.randint(*job_ids))
+        payload = json.dumps(body) if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+            status = None
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if status is None or status >= 400:
+            errors.append((name, status))
+        else:
+            samples.append((name, elapsed_ms))
+    conn.close()
+
+
+def run_load(base_url, users, job_ids, concurrency, duration, warmup):
+    """Drive the server with `concurrency` workers; returns the results dict."""
+    from benchmarks.run_benchmarks import summarize
+
+    if warmup > 0:
+        run_load(base_url, users, job_ids, concurrency, warmup, 0)
+
+    samples = []
+    errors = []
+    stop_at = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(base_url, users, job_ids, stop_at, seed, samples, errors))
+        for seed in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    results = {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests": len(samples),
+        "errors": len(errors),
+        "req_per_s": round(len(samples) / elapsed, 2),
+        "latency": summarize([ms for _, ms in samples]),
+        "endpoints": {},
+    }
+    for name, *_ in REQUEST_MIX:
+        timings = [ms for sample_name, ms in samples if sample_name == name]
+        if timings:
+            results["endpoints"][name] = dict(summarize(timings), req_per_s=round(len(timings) / elapsed, 2))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the job tracker HTTP API.")
+    parser.add_argument("--url", help="Base URL of a running API (default: start one in-process on a temp DB)")
+    parser.add_argument("--users", type=int, default=100, help="Users to seed (or present, with --url)")
+    parser.add_argument("--jobs-per-user", type=int, default=200)
+    parser.add_argument("--job-ids", type=int, nargs=2, metavar=("FIRST", "LAST"), default=(1, 20000),
+                        help="Job id range to request, with --url")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--db-pool-size", type=int, help="Override API_DB_POOL_SIZE for the in-process server")
+    parser.add_argument("--cache-ttl", type=float, help="Override API_CACHE_TTL for the in-process server")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/load-<timestamp>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    server = None
+    config = {}
+    if args.url:
+        base_url = args.url.rstrip("/")
+        job_ids = tuple(args.job_ids)
+    else:
+        # Settings are read when src.config is first imported, so set them before any src import
+        workdir = tempfile.mkdtemp(prefix="jobtracker-load-")
+        os.environ["DB_PATH"] = os.path.join(workdir, "load.db")
+        if args.db_pool_size is not None:
+            os.environ["API_DB_POOL_SIZE"] = str(args.db_pool_size)
+        if args.cache_ttl is not None:
+            os.environ["API_CACHE_TTL"] = str(args.cache_ttl)
+
+        print(f"Seeding {args.users} users x {args.jobs_per_user} jobs...")
+        job_ids = seed_database(os.environ["DB_PATH"], args.users, args.jobs_per_user)
+        from src.config import API_DB_POOL_SIZE, API_CACHE_TTL
+        from src.metrics import metrics
+        metrics.enable()
+        config = {"db_pool_size": API_DB_POOL_SIZE, "cache_ttl": API_CACHE_TTL}
+
+        port = free_port()
+        server, thread = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        print(f"Running {args.concurrency} workers for {args.duration}s against {base_url}...")
+        results = run_load(base_url, args.users, job_ids, args.concurrency, args.duration, args.warmup)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+    from benchmarks.run_benchmarks import RESULTS_DIR, git_commit
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": dict(config, users=args.users, jobs_per_user=args.jobs_per_user),
+        "results": results,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"\nreq/s: {results['req_per_s']}  p99: {results['latency'].get('p99_ms')} ms  errors: {results['errors']}")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,678 @@
+"""
+Offline benchmark suite for the scraping, parsing, AI and database paths.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks                      # parse, ai, memory, db (10k), dedup
+    python -m benchmarks.run_benchmarks --sizes 10k 100k 1m  # bigger DB datasets
+    python -m benchmarks.run_benchmarks --only db --sizes 1m
+    python -m benchmarks.run_benchmarks --only dashboard          # dashboard views on a 1M-row jobs table
+    python -m benchmarks.run_benchmarks --only export --export-size 1m
+    python -m benchmarks.run_benchmarks --only sharding --shards 1 2 4 8
+    python -m benchmarks.run_benchmarks --browser            # also drive Chrome against the fixtures
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<older>.json
+
+Results are written to benchmarks/results/<timestamp>-<commit>.json.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+from datetime import datetime
+
+# Keep the module-level Database instance away from the real data file
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(prefix="jobtracker-bench-"), "jobtracker.db"))
+
+from benchmarks.datasets import DATASET_SIZES, synthetic_jobs
+from benchmarks.fake_model import FakeGeminiModel
+from benchmarks.fixture_server import FixtureServer, load_fixture
+from src.metrics import metrics
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BENCH_SITES = ["linkedin", "indeed", "glassdoor"]
+
+
+def summarize(samples_ms):
+    """Summary statistics for a list of millisecond timings."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {}
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "p50_ms": round(percentile(50), 4),
+        "p95_ms": round(percentile(95), 4),
+        "p99_ms": round(percentile(99), 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def git_commit():
+    """Short hash of the current commit, or 'unknown'."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def offline_browser_controller():
+    """A BrowserController with no WebDriver, for exercising the pure parsing methods."""
+    from src.browser_controller import BrowserController
+    return BrowserController.__new__(BrowserController)
+
+
+def bench_parse(iterations):
+    """Parse throughput of the listing (search_jobs/_extract_job_data) and detail page paths."""
+    from bs4 import BeautifulSoup
+    from src.config import JOB_SITES
+
+    controller = offline_browser_controller()
+    results = {}
+
+    for site_key in BENCH_SITES:
+        site = JOB_SITES[site_key]
+        html = load_fixture(f"{site_key}.html")
+        timings = []
+        jobs_found = 0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            soup = BeautifulSoup(html, "html.parser")
+            jobs = [
+                job for job in (
+                    controller._extract_job_data(element, site, site_key)
+                    for element in soup.select(site["job_listing_selector"])
+                ) if job
+            ]
+            timings.append((time.perf_counter() - start) * 1000.0)
+            jobs_found = len(jobs)
+        total_s = sum(timings) / 1000.0
+        results[site_key] = dict(
+            summarize(timings),
+            jobs_per_page=jobs_found,
+            pages_per_s=round(iterations / total_s, 2),
+            jobs_per_s=round(iterations * jobs_found / total_s, 2),
+        )
+
+    html = load_fixture("job_detail.html")
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        controller._extract_description(html)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    results["job_detail"] = dict(summarize(timings), pages_per_s=round(iterations / (sum(timings) / 1000.0), 2))
+    return results
+
+
+def bench_browser(server, block_resources, query="python developer", location="New York"):
+    """End-to-end search_jobs/get_job_details through Chrome against the local fixture server."""
+    from src.config import JOB_SITES
+    from src.browser_controller import BrowserController
+
+    original_urls = {key: JOB_SITES[key]["url"] for key in BENCH_SITES}
+    controller = BrowserController(headless=True, block_resources=block_resources)
+    results = {}
+    try:
+        for site_key in BENCH_SITES:
+            JOB_SITES[site_key]["url"] = server.search_url_template(site_key)
+            start = time.perf_counter()
+            jobs = controller.search_jobs(site_key, query, location)
+            search_ms = (time.perf_counter() - start) * 1000.0
+            search_page = controller.last_page_stats or {}
+
+            detail_ms = None
+            detail_page = {}
+            if jobs:
+                job = jobs[0]
+                job["url"] = f"{server.base_url}/job/{site_key}/1"
+                start = time.perf_counter()
+                controller.get_job_details(job)
+                detail_ms = (time.perf_counter() - start) * 1000.0
+                detail_page = controller.last_page_stats or {}
+            results[site_key] = {
+                "search_ms": round(search_ms, 2),
+                "jobs_found": len(jobs),
+                "search_page_bytes": search_page.get("total_bytes"),
+                "search_page_load_ms": search_page.get("navigate_ms"),
+                "job_details_ms": round(detail_ms, 2) if detail_ms is not None else None,
+                "detail_page_bytes": detail_page.get("total_bytes"),
+                "detail_page_load_ms": detail_page.get("navigate_ms"),
+            }
+    finally:
+        controller.close()
+        for key, url in original_urls.items():
+            JOB_SITES[key]["url"] = url
+    return results
+
+
+def bench_ai(calls, latency, compact_prompts=True):
+    """AIProcessor end-to-end latency with a fake Gemini model."""
+    from src.ai_processor import AIProcessor
+
+    processor = AIProcessor(api_key=None, compact_prompts=compact_prompts)
+    processor.model = FakeGeminiModel(latency=latency)
+    # Body text as produced by get_job_details when no description element matches
+    description = load_fixture("job_description.txt")
+    profile = {"name": "Bench User", "skills": "Python, SQL", "experience": "5 years", "education": "BSc"}
+    jobs = list(synthetic_jobs(20))
+
+    operations = {
+        "extract_skills": lambda: processor.extract_skills_from_job(description),
+        "calculate_job_match": lambda: processor.calculate_job_match(description, ["Python", "SQL", "Docker"]),
+        "generate_application_tips": lambda: processor.generate_application_tips(description, profile),
+        "analyze_job_market": lambda: processor.analyze_job_market(jobs, "New York"),
+    }
+
+    results = {"model_latency_ms": latency * 1000.0}
+    for name, call in operations.items():
+        timings = []
+        tokens_before = metrics.get_counter("llm_prompt_tokens_total", operation=name)
+        for _ in range(calls):
+            start = time.perf_counter()
+            output = call()
+            timings.append((time.perf_counter() - start) * 1000.0)
+            if "error" in output:
+                raise RuntimeError(f"{name} failed: {output['error']}")
+        summary = summarize(timings)
+        summary["overhead_ms"] = round(summary["mean_ms"] - latency * 1000.0, 4)
+        tokens = metrics.get_counter("llm_prompt_tokens_total", operation=name) - tokens_before
+        summary["prompt_tokens_per_call"] = tokens // max(calls, 1)
+        results[name] = summary
+    if compact_prompts:
+        results["compaction"] = processor.compaction_report()
+    return results
+
+
+def bench_memory(count):
+    """Bytes per in-flight job for plain dicts versus slotted Job records."""
+    import gc
+    import tracemalloc
+    from src.models import Job
+
+    fields = ("title", "company", "location", "url", "source", "description")
+
+    def measure(build):
+        # Strings are rebuilt per record, as they would be when parsed from HTML
+        gc.collect()
+        tracemalloc.start()
+        records = [build({key: "".join(job[key]) for key in fields}) for job in synthetic_jobs(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+        return current / count
+
+    dict_bytes = measure(dict)
+    job_bytes = measure(lambda data: Job(**data))
+    return {
+        "n": count,
+        "dict_bytes_per_job": round(dict_bytes, 1),
+        "job_bytes_per_job": round(job_bytes, 1),
+        "saved_pct": round((1 - job_bytes / dict_bytes) * 100.0, 1),
+    }
+
+
+def bench_db(size, insert_sample, users=100, query_repeats=20):
+    """Database insert and query rates against a fresh file populated with `size` jobs."""
+    from src.database import Database
+
+    workdir = tempfile.mkdtemp(prefix="jobtracker-bench-db-")
+    database = Database(os.path.join(workdir, "bench.db"))
+    for i in range(users):
+        database.add_user(f"user{i}", f"user{i}@example.com", "hash")
+
+    jobs = synthetic_jobs(size, users=users)
+    results = {"size": size}
+
+    # Per-call API inserts (one connection and commit per job, as in production)
+    sample = min(size, insert_sample)
+    job_ids = []
+    start = time.perf_counter()
+    for _ in range(sample):
+        job = next(jobs)
+        job_ids.append(database.add_job(
+            job["user_id"], job["title"], job["company"], job["location"],
+            job["description"], job["url"], job["source"]
+        ))
+    elapsed = time.perf_counter() - start
+    results["add_job"] = {"n": sample, "per_s": round(sample / elapsed, 2), "mean_ms": round(elapsed * 1000.0 / sample, 4)}
+
+    start = time.perf_counter()
+    for job_id in job_ids[:sample]:
+        database.add_skill_to_job(job_id, "Python", True)
+    elapsed = time.perf_counter() - start
+    results["add_skill_to_job"] = {"n": sample, "per_s": round(sample / elapsed, 2)}
+
+    start = time.perf_counter()
+    for job_id in job_ids[:sample]:
+        database.update_job_status(job_id, "applied", "2025-01-01")
+    elapsed = time.perf_counter() - start
+    results["update_job_status"] = {"n": sample, "per_s": round(sample / elapsed, 2)}
+
+    # Bulk-fill the rest of the dataset so the query benchmarks see realistic table sizes
+    import sqlite3
+    conn = sqlite3.connect(database.db_path)
+    start = time.perf_counter()
+    batch = []
+    for job in jobs:
+        batch.append((job["user_id"], job["title"], job["company"], job["location"],
+                      job["description"], job["url"], job["source"], job["status"]))
+        if len(batch) >= 10_000:
+            conn.executemany(
+                "INSERT INTO jobs (user_id, title, company, location, description, url, source, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch
+            )
+            batch = []
+    if batch:
+        conn.executemany(
+            "INSERT INTO jobs (user_id, title, company, location, description, url, source, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch
+        )
+    conn.commit()
+    conn.close()
+    results["bulk_fill_s"] = round(time.perf_counter() - start, 3)
+
+    for label, status in (("get_jobs_by_user", None), ("get_jobs_by_user_status", "applied")):
+        timings = []
+        rows = 0
+        for i in range(query_repeats):
+            start = time.perf_counter()
+            rows += len(database.get_jobs_by_user(1 + (i % users), status))
+            timings.append((time.perf_counter() - start) * 1000.0)
+        results[label] = dict(summarize(timings), rows_per_s=round(rows / (sum(timings) / 1000.0), 2))
+
+    results["db_file_mb"] = round(os.path.getsize(database.db_path) / (1024 * 1024), 2)
+    return results
+
+
+def bench_dedup(size, lookups=200):
+    """Near-duplicate lookup latency against `size` indexed jobs for one user."""
+    import sqlite3
+    from src.database import Database
+    from src.dedup import default_hasher, shingles, lsh_buckets
+
+    workdir = tempfile.mkdtemp(prefix="jobtracker-bench-dedup-")
+    database = Database(os.path.join(workdir, "bench.db"))
+    user_id = database.add_user("dedup", "dedup@example.com", "hash")
+
+    conn = sqlite3.connect(database.db_path)
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    signature_ms = []
+    for job in synthetic_jobs(size, users=1, seed=7):
+        sig_start = time.perf_counter()
+        signature = default_hasher.signature(shingles(job["title"], job["company"], job["description"], location=job["location"]))
+        buckets = lsh_buckets(signature)
+        signature_ms.append((time.perf_counter() - sig_start) * 1000.0)
+        cursor.execute(
+            "INSERT INTO jobs (user_id, title, company, location, description, url, source) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (user_id, job["title"], job["company"], job["location"], job["description"], job["url"], job["source"])
+        )
+        database._index_signature(cursor, cursor.lastrowid, user_id, signature, buckets)
+    conn.commit()
+    conn.close()
+    index_s = time.perf_counter() - start
+
+    # Probe with a mix of exact copies and unseen postings
+    probes = list(synthetic_jobs(lookups // 2, users=1, seed=7)) + list(synthetic_jobs(lookups // 2, users=1, seed=99))
+    timings = []
+    found = 0
+    for job in probes:
+        start = time.perf_counter()
+        if database.find_duplicate(user_id, job["title"], job["company"], job["description"], job["location"]):
+            found += 1
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+    return {
+        "indexed_jobs": size,
+        "index_s": round(index_s, 3),
+        "signature": summarize(signature_ms),
+        "find_duplicate": dict(summarize(timings), duplicates_found=found, probes=len(probes)),
+    }
+
+
+def fill_jobs_with_skills(db_path, size, users):
+    """Bulk-insert `size` synthetic jobs with four skills each (two required) using plain SQL."""
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    jobs = []
+    skills = []
+    job_id = 0
+
+    def flush():
+        conn.executemany("INSERT INTO jobs (id, user_id, title, company, location, description, url, source, status) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", jobs)
+        conn.executemany("INSERT INTO job_skills (job_id, skill, required) VALUES (?, ?, ?)", skills)
+
+    for job in synthetic_jobs(size, users=users):
+        job_id += 1
+        jobs.append((job_id, job["user_id"], job["title"], job["company"], job["location"],
+                     job["description"], job["url"], job["source"], job["status"]))
+        skills.extend((job_id, skill, index < 2) for index, skill in enumerate(job["skills"]))
+        if len(jobs) >= 10_000:
+            flush()
+            jobs, skills = [], []
+    if jobs:
+        flush()
+    conn.commit()
+    conn.close()
+
+
+def bench_dashboard(size, users=1, repeats=20):
+    """
+    Query cost of each dashboard view (src/streamlit_app.py) on a cold cache,
+    against `size` jobs, next to the ad-hoc queries the summaries replace.
+    With users=1 every view covers the whole table.
+    """
+    import sqlite3
+    from src.database import Database
+
+    workdir = tempfile.mkdtemp(prefix="jobtracker-bench-dashboard-")
+    database = Database(os.path.join(workdir, "bench.db"))
+    for i in range(users):
+        database.add_user(f"user{i}", f"user{i}@example.com", "hash")
+
+    start = time.perf_counter()
+    fill_jobs_with_skills(database.db_path, size, users)
+    results = {"size": size, "users": users, "bulk_fill_s": round(time.perf_counter() - start, 3)}
+    conn = sqlite3.connect(database.db_path)
+
+    start = time.perf_counter()
+    database.rebuild_summaries()
+    results["rebuild_summaries_s"] = round(time.perf_counter() - start, 3)
+
+    def timed(call):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000.0)
+        return summarize(timings)
+
+    user_id = 1
+    middle_id = size // 2
+    views = {
+        "data_version": lambda: database.get_data_version(user_id),
+        "status_funnel": lambda: database.get_status_funnel(user_id),
+        "skill_frequency": lambda: database.get_skill_frequency(user_id),
+        "source_yield": lambda: database.get_source_yield(user_id),
+        "jobs_first_page": lambda: database.get_jobs_page(user_id, limit=51),
+        "jobs_deep_page": lambda: database.get_jobs_page(user_id, before_id=middle_id, limit=51),
+        "jobs_status_page": lambda: database.get_jobs_page(user_id, status="offer", before_id=middle_id, limit=51),
+    }
+    results["views"] = {name: timed(call) for name, call in views.items()}
+    results["cold_render_ms"] = round(sum(view["mean_ms"] for view in results["views"].values()), 3)
+
+    adhoc = {
+        "status_counts": ("SELECT status, COUNT(*) FROM jobs WHERE user_id = ? GROUP BY status", (user_id,)),
+        "skill_frequency": (
+            "SELECT s.skill, COUNT(*) AS n FROM job_skills s JOIN jobs j ON j.id = s.job_id "
+            "WHERE j.user_id = ? GROUP BY s.skill ORDER BY n DESC LIMIT 20", (user_id,)
+        ),
+        "source_yield": (
+            "SELECT source, COUNT(*), SUM(status != 'discovered') FROM jobs WHERE user_id = ? GROUP BY source", (user_id,)
+        ),
+        "jobs_deep_page_offset": (
+            "SELECT id, title, company FROM jobs WHERE user_id = ? ORDER BY id DESC LIMIT 51 OFFSET ?",
+            (user_id, (size // users) // 2)
+        ),
+    }
+    results["adhoc"] = {
+        name: timed(lambda query=query, params=params: conn.execute(query, params).fetchall())
+        for name, (query, params) in adhoc.items()
+    }
+    conn.close()
+    results["db_file_mb"] = round(os.path.getsize(database.db_path) / (1024 * 1024), 2)
+    return results
+
+
+def bench_export(size, users=1, chunk_size=10_000):
+    """
+    Streaming export throughput per format and description mode, and peak
+    memory of a full export next to loading the same jobs with get_jobs_by_user.
+    """
+    import gc
+    import tracemalloc
+    from src.database import Database
+
+    workdir = tempfile.mkdtemp(prefix="jobtracker-bench-export-")
+    database = Database(os.path.join(workdir, "bench.db"))
+    for i in range(users):
+        database.add_user(f"user{i}", f"user{i}@example.com", "hash")
+    fill_jobs_with_skills(database.db_path, size, users)
+
+    try:
+        import pyarrow  # noqa: F401
+        formats = ["parquet", "arrow", "csv"]
+    except ImportError:
+        formats = ["csv"]
+
+    results = {"size": size, "chunk_size": chunk_size}
+    for fmt in formats:
+        for description in ("include", "exclude", "compress"):
+            path = os.path.join(workdir, f"export-{description}.{fmt}")
+            stats = database.export_jobs(path, fmt=fmt, description=description, chunk_size=chunk_size)
+            results[f"{fmt}_{description}"] = {
+                "rows_per_s": round(stats["rows"] / stats["seconds"], 1),
+                "seconds": stats["seconds"],
+                "file_mb": round(stats["bytes"] / (1024 * 1024), 2),
+            }
+            os.remove(path)
+
+    # Peak memory is measured in separate runs, since tracemalloc slows everything down
+    def peak_mb(call):
+        gc.collect()
+        tracemalloc.start()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return round(peak / (1024 * 1024), 2)
+
+    for fmt in formats:
+        path = os.path.join(workdir, f"export.{fmt}")
+        results[f"{fmt}_include"]["python_peak_mb"] = peak_mb(
+            lambda: database.export_jobs(path, fmt=fmt, chunk_size=chunk_size)
+        )
+        os.remove(path)
+
+    # The same jobs loaded as records, for comparison with the constant-memory export
+    start = time.perf_counter()
+    loaded = sum(len(database.get_jobs_by_user(user_id)) for user_id in range(1, users + 1))
+    elapsed = time.perf_counter() - start
+    results["get_jobs_by_user"] = {
+        "rows": loaded,
+        "rows_per_s": round(loaded / elapsed, 1),
+        "python_peak_mb": peak_mb(lambda: database.get_jobs_by_user(1)),
+    }
+    return results
+
+
+def bench_sharding(shard_counts=(1, 2, 4, 8), writers=8, users=64, jobs_per_writer=200):
+    """
+    Write throughput as the shard count grows: `writers` threads each add jobs
+    (and move them to "applied") for their own users through one Database.
+    One shard is the plain single-file Database. Measured with a connection
+    per call (rollback journal, fsync on commit) and with a pool per file
+    (WAL, synchronous=NORMAL), where commits are cheap and the CPU is the limit.
+    """
+    import threading
+    from src.database import Database
+
+    users = max(users, writers)
+    jobs = list(synthetic_jobs(writers * jobs_per_writer, users=users))
+    results = {"writers": writers, "users": users, "jobs": len(jobs)}
+    for mode, pool_size in (("connection_per_call", 0), ("wal_pool", writers)):
+        results[mode] = {}
+        for shards in shard_counts:
+            workdir = tempfile.mkdtemp(prefix="jobtracker-bench-sharding-")
+            database = Database(os.path.join(workdir, "bench.db"), pool_size, shards=shards)
+            user_ids = [database.add_user(f"user{i}", f"user{i}@example.com", "hash") for i in range(users)]
+            errors = []
+
+            def write(worker):
+                # Writers own disjoint users, as scraper workers usually do
+                own_users = user_ids[worker::writers]
+                for index, job in enumerate(jobs[worker::writers]):
+                    user_id = own_users[index % len(own_users)]
+                    job_id = database.add_job(user_id, job["title"], job["company"], job["location"],
+                                              job["description"], job["url"], job["source"], dedup=False)
+                    if job_id is None or not database.update_job_status(job_id, "applied"):
+                        errors.append(job_id)
+
+            threads = [threading.Thread(target=write, args=(worker,)) for worker in range(writers)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            overview = database.get_overview()
+            overview_ms = (time.perf_counter() - start) * 1000.0
+            database.close()
+            results[mode][f"{shards}_shards"] = {
+                "seconds": round(elapsed, 3),
+                "jobs_per_s": round(len(jobs) / elapsed, 1),
+                "errors": len(errors),
+                "jobs_stored": overview["jobs"],
+                "overview_ms": round(overview_ms, 3),
+            }
+    return results
+
+
+def flatten(results, prefix=""):
+    """Flatten nested result dicts to {"a.b.c": number}."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(baseline_path, current):
+    """Print the relative change of every numeric metric against a baseline results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = flatten(baseline["results"])
+    new = flatten(current["results"])
+    print(f"\nComparison against {baseline.get('commit')} ({baseline_path}):")
+    for key in sorted(set(old) & set(new)):
+        if old[key]:
+            change = (new[key] - old[key]) / old[key] * 100.0
+            print(f"  {key:<60} {old[key]:>14} -> {new[key]:>14} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline job tracker benchmarks.")
+    parser.add_argument("--only", nargs="+", choices=["parse", "browser", "ai", "memory", "db", "dedup", "dashboard", "export", "sharding"],
+                        help="Run only these benchmark groups")
+    parser.add_argument("--browser", action="store_true", help="Include the Chrome end-to-end benchmark")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], choices=sorted(DATASET_SIZES),
+                        help="Synthetic dataset sizes for the database benchmark")
+    parser.add_argument("--parse-iterations", type=int, default=200)
+    parser.add_argument("--ai-calls", type=int, default=20)
+    parser.add_argument("--ai-latency", type=float, default=0.05, help="Fake model latency in seconds")
+    parser.add_argument("--memory-jobs", type=int, default=100_000,
+                        help="Number of in-flight jobs for the memory benchmark")
+    parser.add_argument("--dedup-size", type=int, default=20_000,
+                        help="Number of indexed jobs for the near-duplicate lookup benchmark")
+    parser.add_argument("--dashboard-size", default="1m", choices=sorted(DATASET_SIZES),
+                        help="Jobs table size for the dashboard benchmark")
+    parser.add_argument("--export-size", default="100k", choices=sorted(DATASET_SIZES),
+                        help="Number of jobs for the export benchmark")
+    parser.add_argument("--shards", nargs="+", type=int, default=[1, 2, 4, 8],
+                        help="Shard counts for the write throughput benchmark")
+    parser.add_argument("--writers", type=int, default=8, help="Writer threads for the sharding benchmark")
+    parser.add_argument("--insert-sample", type=int, default=2000,
+                        help="Number of jobs inserted through Database.add_job before bulk fill")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    groups = set(args.only or ["parse", "ai", "memory", "db", "dedup"] + (["browser"] if args.browser else []))
+    metrics.enable()
+    metrics.reset()
+
+    results = {}
+    if "parse" in groups:
+        print("Running parse benchmarks...")
+        results["parse"] = bench_parse(args.parse_iterations)
+    if "browser" in groups:
+        print("Running browser benchmarks...")
+        with FixtureServer() as server:
+            results["browser"] = {
+                "unblocked": bench_browser(server, block_resources=False),
+                "blocked": bench_browser(server, block_resources=True),
+            }
+    if "ai" in groups:
+        print("Running AI benchmarks...")
+        results["ai"] = {
+            "raw": bench_ai(args.ai_calls, args.ai_latency, compact_prompts=False),
+            "compacted": bench_ai(args.ai_calls, args.ai_latency, compact_prompts=True),
+        }
+    if "memory" in groups:
+        print("Running memory benchmarks...")
+        results["memory"] = bench_memory(args.memory_jobs)
+    if "db" in groups:
+        results["db"] = {}
+        for size_name in args.sizes:
+            print(f"Running database benchmarks ({size_name})...")
+            results["db"][size_name] = bench_db(DATASET_SIZES[size_name], args.insert_sample)
+
+    if "dedup" in groups:
+        print(f"Running dedup benchmarks ({args.dedup_size} indexed jobs)...")
+        results["dedup"] = bench_dedup(args.dedup_size)
+
+    if "dashboard" in groups:
+        print(f"Running dashboard benchmarks ({args.dashboard_size})...")
+        results["dashboard"] = bench_dashboard(DATASET_SIZES[args.dashboard_size])
+
+    if "export" in groups:
+        print(f"Running export benchmarks ({args.export_size})...")
+        results["export"] = bench_export(DATASET_SIZES[args.export_size])
+
+    if "sharding" in groups:
+        print(f"Running sharding benchmarks ({args.writers} writers)...")
+        results["sharding"] = bench_sharding(args.shards, args.writers)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "metrics": metrics.snapshot(),
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,14 @@ import os
 import re
 import time
 import logging
+import threading
 import google.generativeai as genai
 from bs4 import BeautifulSoup
 
-from src.config import GEMINI_API_KEY, OPENAI_API_KEY
+from src.config import GEMINI_API_KEY, OPENAI_API_KEY, COMPACT_PROMPTS, PROMPT_TOKEN_BUDGETS
+from src.metrics import metrics
+from src.models import JobSkill
+from src.prompt_compactor import compact_description
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -18,10 +22,14 @@ if GEMINI_API_KEY:
 class AIProcessor:
     """Processes job descriptions using AI to extract skills and provide insights."""
     
-    def __init__(self, api_key=None, model="gemini-pro"):
+    def __init__(self, api_key=None, model="gemini-pro", compact_prompts=COMPACT_PROMPTS):
         """Initialize the AI processor with appropriate API keys."""
         self.model_name = model
         self.api_key = api_key or GEMINI_API_KEY
+        self.compact_prompts = compact_prompts
+        self.compaction_stats = {}
+        # One processor may serve several worker threads (see src/api.py)
+        self._stats_lock = threading.Lock()
         self._setup_model()
     
     def _setup_model(self):
@@ -65,6 +73,58 @@ class AIProcessor:
             logger.error(f"Unsupported model: {self.model_name}")
             self.model = None
     
+    def _generate(self, operation, prompt):
+        """Call the model, recording latency and token usage for the operation."""
+        metrics.inc("llm_requests_total", operation=operation)
+        with metrics.span("llm_latency_ms", operation=operation):
+            response = self.model.generate_content(prompt)
+        
+        if metrics.enabled:
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                metrics.inc("llm_prompt_tokens_total", getattr(usage, "prompt_token_count", 0) or 0, operation=operation)
+                metrics.inc("llm_output_tokens_total", getattr(usage, "candidates_token_count", 0) or 0, operation=operation)
+        
+        return response
+    
+    def _compact(self, operation, job_description):
+        """Trim a job description to the operation's token budget and record the savings."""
+        budget = PROMPT_TOKEN_BUDGETS.get(operation)
+        if not self.compact_prompts or not budget or not job_description:
+            return job_description
+        
+        compacted, stats = compact_description(job_description, budget)
+        with self._stats_lock:
+            totals = self.compaction_stats.setdefault(operation, {"calls": 0, "original_tokens": 0, "compacted_tokens": 0})
+            totals["calls"] += 1
+            totals["original_tokens"] += stats["original_tokens"]
+            totals["compacted_tokens"] += stats["compacted_tokens"]
+        metrics.inc("prompt_tokens_saved_total", stats["original_tokens"] - stats["compacted_tokens"], operation=operation)
+        return compacted
+    
+    def compaction_report(self):
+        """Summarize tokens saved by prompt compaction, per operation and overall."""
+        report = {}
+        original = compacted = 0
+        with self._stats_lock:
+            snapshot = {operation: dict(totals) for operation, totals in self.compaction_stats.items()}
+        for operation, totals in snapshot.items():
+            saved = totals["original_tokens"] - totals["compacted_tokens"]
+            report[operation] = dict(
+                totals,
+                tokens_saved=saved,
+                saved_pct=round(saved / totals["original_tokens"] * 100.0, 1) if totals["original_tokens"] else 0.0,
+            )
+            original += totals["original_tokens"]
+            compacted += totals["compacted_tokens"]
+        report["total"] = {
+            "original_tokens": original,
+            "compacted_tokens": compacted,
+            "tokens_saved": original - compacted,
+            "saved_pct": round((original - compacted) / original * 100.0, 1) if original else 0.0,
+        }
+        return report
+    
     def extract_skills_from_job(self, job_description):
         """Extract required and preferred skills from a job description."""
         if not self.model:
@@ -72,6 +132,7 @@ class AIProcessor:
             return {"required": [], "preferred": [], "error": "AI model not available"}
         
         try:
+            job_description = self._compact("extract_skills", job_description)
             prompt = f"""
             Extract skills from this job description, categorizing them as either "required" or "preferred".
             For each skill, assign a relevance score from 1-10.
@@ -94,7 +155,7 @@ class AIProcessor:
             Do not include any explanations, only provide the JSON response.
             """
             
-            response = self.model.generate_content(prompt)
+            response = self._generate("extract_skills", prompt)
             response_text = response.text
             
             # Extract JSON from response
@@ -117,6 +178,22 @@ class AIProcessor:
             logger.error(f"Error extracting skills: {e}")
             return {"required": [], "preferred": [], "error": str(e)}
     
+    def extract_job_skills(self, job_description, job_id=None, raise_errors=False):
+        """
+        Extract skills from a job description as a list of JobSkill records.
+        Failures yield an empty list unless raise_errors is set, in which case
+        they raise RuntimeError with the error message.
+        """
+        skills_data = self.extract_skills_from_job(job_description)
+        if raise_errors and "error" in skills_data:
+            raise RuntimeError(f"Skill extraction failed: {skills_data['error']}")
+        return [
+            JobSkill(skill=item["skill"], required=category == "required", job_id=job_id, relevance=item.get("relevance"))
+            for category in ("required", "preferred")
+            for item in skills_data.get(category, [])
+            if isinstance(item, dict) and item.get("skill")
+        ]
+    
     def calculate_job_match(self, job_description, user_skills):
         """Calculate how well a user's skills match a job description."""
         if not self.model:
@@ -124,6 +201,8 @@ class AIProcessor:
             return {"match_percentage": 0, "missing_skills": [], "matching_skills": [], "error": "AI model not available"}
         
         try:
+            job_description = self._compact("calculate_job_match", job_description)
+            
             # Convert skills list to string
             skills_str = ", ".join(user_skills)
             
@@ -154,7 +233,7 @@ class AIProcessor:
             Do not include any explanations, only provide the JSON response.
             """
             
-            response = self.model.generate_content(prompt)
+            response = self._generate("calculate_job_match", prompt)
             response_text = response.text
             
             # Extract JSON from response
@@ -183,6 +262,8 @@ class AIProcessor:
             return {"resume_tips": [], "cover_letter_tips": [], "error": "AI model not available"}
         
         try:
+            job_description = self._compact("generate_application_tips", job_description)
+            
             # Format user profile data
             profile_text = f"""
             Name: {user_profile.get('name', 'Not specified')}
@@ -220,7 +301,7 @@ class AIProcessor:
             Do not include any explanations, only provide the JSON response.
             """
             
-            response = self.model.generate_content(prompt)
+            response = self._generate("generate_application_tips", prompt)
             response_text = response.text
             
             # Extract JSON from response
@@ -283,7 +364,7 @@ class AIProcessor:
             Do not include any explanations, only provide the JSON response.
             """
             
-            response = self.model.generate_content(prompt)
+            response = self._generate("analyze_job_market", prompt)
             response_text = response.text
             
             # Extract JSON from response
@@ -0,0 +1,443 @@
+import json
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src.config import (
+    API_HOST, API_PORT, API_DB_POOL_SIZE, BROWSER_POOL_SIZE, API_CACHE_TTL, API_TASK_HISTORY,
+    DB_PATH, HEADLESS_BROWSER, JOB_SITES,
+)
+from src.database import Database
+from src.metrics import metrics
+from src.search_cache import SearchCache
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class JobIn(BaseModel):
+    title: str
+    company: str
+    location: Optional[str] = None
+    description: Optional[str] = None
+    url: Optional[str] = None
+    source: Optional[str] = "manual"
+
+
+class StatusIn(BaseModel):
+    status: str
+    applied_date: Optional[str] = None
+
+
+class SearchIn(BaseModel):
+    user_id: int
+    site: str
+    query: str
+    location: Optional[str] = None
+    save: bool = True
+
+
+class ResponseCache:
+    """
+    Short-lived cache for read endpoints, keyed per user.
+    Writes that touch a user drop that user's entries, so a client never
+    reads its own stale data; TTL expiry covers writes made by other processes.
+    Safe to invalidate from worker threads.
+    """
+    def __init__(self, ttl=API_CACHE_TTL, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, key):
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[(user_id, key)]
+                entry = None
+        if entry is None:
+            metrics.inc("cache_misses_total", cache="api")
+            return None
+        metrics.inc("cache_hits_total", cache="api")
+        return entry[1]
+
+    def put(self, user_id, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(user_id, key)] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end((user_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == user_id]:
+                del self._entries[cache_key]
+
+
+class TaskManager:
+    """
+    Runs slow work (crawls, LLM calls) in worker threads so requests return at once.
+    Clients poll GET /tasks/{id} or follow GET /tasks/{id}/events (server-sent
+    events). Worker functions receive a `progress(message, **data)` callback
+    that is safe to call from their thread.
+    """
+    def __init__(self, history=API_TASK_HISTORY):
+        self.history = history
+        self._tasks = OrderedDict()
+        self._subscribers = {}
+        self._loop = None
+
+    def _publish(self, task_id, event, data):
+        task = self._tasks.get(task_id)
+        if task is None:
+            return
+        if event == "progress":
+            task["progress"].append(data)
+        for subscriber in self._subscribers.get(task_id, ()):
+            subscriber.put_nowait((event, data))
+
+    def submit(self, kind, func, *args):
+        """Start func(progress, *args) in a worker thread and return the task record."""
+        self._loop = asyncio.get_running_loop()
+        task_id = uuid.uuid4().hex
+        task = {
+            "id": task_id,
+            "kind": kind,
+            "status": "pending",
+            "progress": [],
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        self._tasks[task_id] = task
+        self._trim()
+
+        def progress(message, **data):
+            self._loop.call_soon_threadsafe(self._publish, task_id, "progress", dict(data, message=message))
+
+        async def run():
+            task["status"] = "running"
+            self._publish(task_id, "status", {"status": "running"})
+            try:
+                with metrics.span("api_task_ms", kind=kind):
+                    task["result"] = await asyncio.to_thread(func, progress, *args)
+                task["status"] = "done"
+            except Exception as e:
+                logger.error(f"Task {task_id} ({kind}) failed: {e}")
+                task["status"] = "failed"
+                task["error"] = str(e)
+            task["finished_at"] = time.time()
+            metrics.inc("api_tasks_total", kind=kind, status=task["status"])
+            self._publish(task_id, "status", {"status": task["status"]})
+
+        self._loop.create_task(run())
+        return task
+
+    def _trim(self):
+        """Forget the oldest finished tasks beyond the history limit."""
+        if len(self._tasks) <= self.history:
+            return
+        for task_id in list(self._tasks):
+            if len(self._tasks) <= self.history:
+                break
+            if self._tasks[task_id]["status"] in ("done", "failed"):
+                del self._tasks[task_id]
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    async def events(self, task_id):
+        """Yield (event, data) for a task until it finishes."""
+        task = self._tasks[task_id]
+        subscriber = asyncio.Queue()
+        self._subscribers.setdefault(task_id, []).append(subscriber)
+        try:
+            # Replay what happened before the client subscribed
+            yield "status", {"status": task["status"]}
+            for data in list(task["progress"]):
+                yield "progress", data
+            while task["status"] not in ("done", "failed"):
+                event, data = await subscriber.get()
+                if event == "status":
+                    continue
+                yield event, data
+            yield "result", {"status": task["status"], "result": task["result"], "error": task["error"]}
+        finally:
+            self._subscribers[task_id].remove(subscriber)
+            if not self._subscribers[task_id]:
+                del self._subscribers[task_id]
+
+
+def _browsers(state):
+    """The browser pool, created on first use so Selenium is only needed for searches."""
+    with state.lazy_lock:
+        if state.browsers is None:
+            from src.browser_controller import BrowserPool
+            state.browsers = BrowserPool(size=BROWSER_POOL_SIZE, headless=HEADLESS_BROWSER)
+        return state.browsers
+
+
+def _ai(state):
+    """The AI processor, created on first use so Gemini is only needed for enrichment."""
+    with state.lazy_lock:
+        if state.ai is None:
+            from src.ai_processor import AIProcessor
+            state.ai = AIProcessor()
+        return state.ai
+
+
+def _search_task(state, progress, request):
+    """Background search: crawl (or reuse a cached crawl) and optionally save the jobs."""
+    progress("searching", site=request.site, query=request.query)
+    # Only a search that really crawls checks out a browser
+    jobs = state.search_cache.search(
+        lambda: _browsers(state).browser(), request.site, request.query, request.location, user_id=request.user_id
+    )
+    progress("found", count=len(jobs))
+
+    job_ids = []
+    if request.save:
+        for job in jobs:
+            job_id = state.db.add_job(
+                request.user_id, job.title, job.company, job.location, job.description, job.url, job.source
+            )
+            if job_id is not None:
+                job_ids.append(job_id)
+        progress("saved", count=len(job_ids))
+    return {"count": len(jobs), "job_ids": job_ids, "jobs": [job.to_dict() for job in jobs] if not request.save else None}
+
+
+def _enrich_task(state, progress, job):
+    """
+    Background enrichment: extract skills and score the job against the user's profile.
+    A duplicate linked to a canonical job shares that job's skills and match
+    score (see Database.add_job), so it is answered without calling the model.
+    """
+    if job.canonical_job_id is not None:
+        progress("duplicate", canonical_job_id=job.canonical_job_id)
+        skills = state.db.get_job_skills(job.id)
+        match = {"match_percentage": job.match_score} if job.match_score is not None else None
+        return {"skills": [skill.to_dict() for skill in skills], "match": match, "canonical_job_id": job.canonical_job_id}
+
+    ai = _ai(state)
+    progress("extracting_skills")
+    skills = ai.extract_job_skills(job.description or "", job_id=job.id, raise_errors=True)
+    if skills:
+        state.db.add_job_skills(job.id, skills)
+    progress("skills_saved", count=len(skills))
+
+    match = None
+    profile = state.db.get_profile(job.user_id)
+    user_skills = [skill.strip() for skill in ((profile or {}).get("skills") or "").split(",") if skill.strip()]
+    if user_skills:
+        progress("matching")
+        match = ai.calculate_job_match(job.description or "", user_skills)
+        if "error" in match:
+            raise RuntimeError(f"Job matching failed: {match['error']}")
+        state.db.set_match_score(job.id, match.get("match_percentage"))
+    return {"skills": [skill.to_dict() for skill in skills], "match": match}
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Create the shared resources once per process and release them on shutdown."""
+    state = app.state
+    state.db = Database(DB_PATH, pool_size=API_DB_POOL_SIZE)
+    # Browsers and the AI processor are built on first use (see _browsers/_ai),
+    # so the API starts on machines without Selenium/Gemini installed; only
+    # search and enrich tasks fail there.
+    state.browsers = None
+    state.ai = None
+    state.lazy_lock = threading.Lock()
+    state.search_cache = SearchCache(state.db)
+    state.cache = ResponseCache()
+    state.tasks = TaskManager()
+
+    # Writes made outside the API's own handlers (e.g. by the follow-up engine)
+    # still clear the affected user's cached reads.
+    def on_change(event, payload):
+        if payload.get("user_id") is not None:
+            state.cache.invalidate(payload["user_id"])
+
+    state.db.add_listener(on_change)
+    try:
+        yield
+    finally:
+        state.db.remove_listener(on_change)
+        if state.browsers is not None:
+            await run_in_threadpool(state.browsers.close)
+        state.db.close()
+
+
+app = FastAPI(title="Job Tracker API", lifespan=lifespan)
+
+
+async def _cached(request, user_id, key, func, *args):
+    """Serve a read from the response cache, running func in the threadpool on a miss."""
+    cache = request.app.state.cache
+    value = cache.get(user_id, key)
+    if value is None:
+        value = await run_in_threadpool(func, *args)
+        cache.put(user_id, key, value)
+    return value
+
+
+async def _get_job(request, job_id):
+    jobs = await run_in_threadpool(request.app.state.db.get_jobs_by_ids, [job_id])
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    metrics.observe("api_request_ms", (time.perf_counter() - start) * 1000.0, method=request.method, path=path)
+    metrics.inc("api_requests_total", method=request.method, path=path, status=response.status_code)
+    return response
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/users/{user_id}/jobs")
+async def list_jobs(
+    request: Request, user_id: int, status: Optional[str] = None,
+    before_id: Optional[int] = None, limit: int = Query(50, ge=1, le=200),
+):
+    """
+    One page of a user's jobs, newest first and without descriptions. Pass a
+    page's next_before_id as before_id for the next page.
+    """
+    db = request.app.state.db
+
+    def load():
+        return [job.to_dict() for job in db.get_jobs_page(user_id, status, None, before_id, limit)]
+
+    jobs = await _cached(request, user_id, ("jobs", status, before_id, limit), load)
+    # The total comes from the funnel aggregates rather than a COUNT(*) over jobs
+    stages = (await _cached(request, user_id, ("funnel",), db.get_status_funnel, user_id))["stages"]
+    if status:
+        total = stages[status]["current"] if status in stages else 0
+    else:
+        total = sum(stage["current"] for stage in stages.values())
+    next_before_id = jobs[-1]["id"] if len(jobs) == limit else None
+    return {"total": total, "limit": limit, "next_before_id": next_before_id, "jobs": jobs}
+
+
+@app.post("/users/{user_id}/jobs", status_code=201)
+async def add_job(request: Request, user_id: int, job: JobIn):
+    state = request.app.state
+    job_id = await run_in_threadpool(
+        state.db.add_job, user_id, job.title, job.company, job.location, job.description, job.url, job.source
+    )
+    if job_id is None:
+        raise HTTPException(status_code=500, detail="Could not add job")
+    state.cache.invalidate(user_id)
+    return {"id": job_id}
+
+
+@app.get("/users/{user_id}/funnel")
+async def funnel(request: Request, user_id: int):
+    return await _cached(request, user_id, ("funnel",), request.app.state.db.get_status_funnel, user_id)
+
+
+@app.get("/jobs/{job_id}/skills")
+async def job_skills(request: Request, job_id: int):
+    skills = await run_in_threadpool(request.app.state.db.get_job_skills, job_id)
+    return [skill.to_dict() for skill in skills]
+
+
+@app.patch("/jobs/{job_id}/status")
+async def update_status(request: Request, job_id: int, update: StatusIn):
+    state = request.app.state
+    job = await _get_job(request, job_id)
+    updated = await run_in_threadpool(state.db.update_job_status, job_id, update.status, update.applied_date)
+    if not updated:
+        raise HTTPException(status_code=500, detail="Could not update status")
+    state.cache.invalidate(job.user_id)
+    return {"id": job_id, "status": update.status}
+
+
+@app.post("/searches", status_code=202)
+async def start_search(request: Request, search: SearchIn):
+    state = request.app.state
+    if search.site not in JOB_SITES:
+        raise HTTPException(status_code=400, detail=f"Unknown site: {search.site}")
+
+    def run(progress, search):
+        result = _search_task(state, progress, search)
+        if search.save:
+            state.cache.invalidate(search.user_id)
+        return result
+
+    task = state.tasks.submit("search", run, search)
+    return {"task_id": task["id"], "status": task["status"]}
+
+
+@app.post("/jobs/{job_id}/enrich", status_code=202)
+async def enrich_job(request: Request, job_id: int):
+    state = request.app.state
+    job = await _get_job(request, job_id)
+
+    def run(progress, job):
+        result = _enrich_task(state, progress, job)
+        state.cache.invalidate(job.user_id)
+        return result
+
+    task = state.tasks.submit("enrich", run, job)
+    return {"task_id": task["id"], "status": task["status"]}
+
+
+@app.get("/tasks/{task_id}")
+async def task_status(request: Request, task_id: str):
+    task = request.app.state.tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(request: Request, task_id: str):
+    tasks = request.app.state.tasks
+    if tasks.get(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    async def stream():
+        async for event, data in tasks.events(task_id):
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return metrics.to_prometheus()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    metrics.enable()
+    uvicorn.run(app, host=API_HOST, port=API_PORT)
@@ -12,20 +12,56 @@ from bs4 import BeautifulSoup
 import logging
 import threading
 import queue
+from collections import deque
+from contextlib import contextmanager
 
-from src.config import HEADLESS_BROWSER, USER_AGENTS, JOB_SITES
+from src.config import (
+    HEADLESS_BROWSER, BLOCK_RESOURCES, BLOCKED_URL_PATTERNS, PAGE_STATS_HISTORY, PAGE_STATS_WAIT, USER_AGENTS,
+    JOB_SITES,
+)
+from src.metrics import metrics
+from src.models import Job
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Common job description selectors, tried in order
+DESCRIPTION_SELECTORS = [
+    ".job-description",
+    "#job-description",
+    ".description",
+    ".job-details",
+    "section.description",
+    "[data-automation='jobDescriptionText']"
+]
+
+# Collects transfer sizes and timings for the current page from the Performance API
+PAGE_STATS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let resourceBytes = 0;
+for (const r of resources) { resourceBytes += r.transferSize || 0; }
+return {
+    document_bytes: nav ? nav.transferSize : 0,
+    resource_bytes: resourceBytes,
+    resources: resources.length,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null
+};
+"""
+
 class BrowserController:
     """
     Controls a Selenium browser for job searching and scraping.
     Shows the browser to the user for transparency.
     """
-    def __init__(self, headless=HEADLESS_BROWSER):
+    def __init__(self, headless=HEADLESS_BROWSER, block_resources=BLOCK_RESOURCES):
         self.headless = headless
+        self.block_resources = block_resources
+        self._blocked_patterns = None
+        self.page_stats = deque(maxlen=PAGE_STATS_HISTORY)
+        self.last_page_stats = None
         self._setup_driver()
         self.job_queue = queue.Queue()
         self.results_queue = queue.Queue()
@@ -48,12 +84,73 @@ class BrowserController:
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--window-size=1920,1080")
         
+        # Return from get() once the DOM is parsed instead of waiting for every sub-resource
+        options.page_load_strategy = "eager"
+        
         # Use webdriver manager to handle driver installation
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
         
+        if self.block_resources:
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self._set_blocked_urls(BLOCKED_URL_PATTERNS)
+            except Exception as e:
+                logger.warning(f"Resource blocking unavailable: {e}")
+                self.block_resources = False
+        
         logger.info("Browser driver initialized")
     
+    def _set_blocked_urls(self, patterns):
+        """Tell Chrome which URL patterns to block, skipping the call if unchanged."""
+        if patterns == self._blocked_patterns:
+            return
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        self._blocked_patterns = patterns
+    
+    def _apply_resource_policy(self, site_key):
+        """Apply the block list minus the site's allowlist before loading one of its pages."""
+        if not self.block_resources:
+            return
+        allowed = set(JOB_SITES.get(site_key, {}).get("allowed_resources", []))
+        try:
+            self._set_blocked_urls([pattern for pattern in BLOCKED_URL_PATTERNS if pattern not in allowed])
+        except Exception as e:
+            logger.warning(f"Could not apply resource policy for {site_key}: {e}")
+    
+    def _record_page_stats(self, url, navigate_ms, timeout=0):
+        """
+        Record bytes transferred and load timings for the page just loaded.
+        With the eager load strategy get() returns before sub-resources finish,
+        so this polls for up to `timeout` seconds until the load event has
+        fired; with no timeout it reads once, and load_ms is None for a page
+        still loading.
+        """
+        deadline = time.perf_counter() + timeout
+        try:
+            while True:
+                stats = self.driver.execute_script(PAGE_STATS_SCRIPT) or {}
+                if stats.get("load_ms") is not None or time.perf_counter() >= deadline:
+                    break
+                time.sleep(0.1)
+        except Exception as e:
+            logger.debug(f"Could not collect page stats for {url}: {e}")
+            return None
+        
+        stats["url"] = url
+        stats["navigate_ms"] = round(navigate_ms, 2)
+        stats["total_bytes"] = (stats.get("document_bytes") or 0) + (stats.get("resource_bytes") or 0)
+        stats["blocking"] = self.block_resources
+        self.last_page_stats = stats
+        self.page_stats.append(stats)
+        
+        metrics.inc("page_bytes_total", stats["total_bytes"])
+        metrics.observe("page_transfer_kb", stats["total_bytes"] / 1024.0)
+        if stats.get("load_ms") is not None:
+            metrics.observe("page_load_ms", stats["load_ms"])
+        logger.debug(f"Loaded {url}: {stats['total_bytes']} bytes, {stats['resources']} resources, {navigate_ms:.0f} ms")
+        return stats
+    
     def close(self):
         """Close the browser."""
         if hasattr(self, 'driver'):
@@ -63,16 +160,29 @@ class BrowserController:
     def navigate_to(self, url, wait_time=3):
         """Navigate to a URL and wait for the page to load."""
         try:
-            self.driver.get(url)
+            start = time.perf_counter()
+            with metrics.span("browser_navigate_ms"):
+                self.driver.get(url)
+            navigate_ms = (time.perf_counter() - start) * 1000.0
+            metrics.inc("pages_fetched_total", result="ok")
             # Add a random delay to look more human-like
             time.sleep(wait_time + random.uniform(0.5, 2.0))
+            # Sub-resources keep loading after an eager get(); the crawl only
+            # waits for them to count them when metrics are being collected
+            self._record_page_stats(url, navigate_ms, timeout=PAGE_STATS_WAIT if metrics.enabled else 0)
             return True
         except Exception as e:
+            metrics.inc("pages_fetched_total", result="error")
             logger.error(f"Error navigating to {url}: {e}")
             return False
     
     def search_jobs(self, site_key, query, location=None):
         """Search for jobs on a specific site."""
+        with metrics.span("browser_search_ms", site=site_key):
+            return self._search_jobs(site_key, query, location)
+
+    def _search_jobs(self, site_key, query, location):
+        """Run a search and extract the listings (see search_jobs)."""
         site = JOB_SITES.get(site_key)
         if not site:
             logger.error(f"Site {site_key} not found in configuration")
@@ -86,6 +196,7 @@ class BrowserController:
         
         logger.info(f"Searching for jobs on {site_key}: {url}")
         
+        self._apply_resource_policy(site_key)
         if not self.navigate_to(url):
             return []
         
@@ -103,10 +214,11 @@ class BrowserController:
         try:
             # Get the page HTML
             page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Find all job listings
-            job_elements = soup.select(site["job_listing_selector"])
+            with metrics.span("browser_parse_ms", site=site_key):
+                soup = BeautifulSoup(page_source, 'html.parser')
+                
+                # Find all job listings
+                job_elements = soup.select(site["job_listing_selector"])
             
             for job_element in job_elements:
                 job = self._extract_job_data(job_element, site, site_key)
@@ -124,6 +236,7 @@ class BrowserController:
         except Exception as e:
             logger.error(f"Error extracting jobs from {site_key}: {e}")
         
+        metrics.inc("jobs_extracted_total", len(jobs), site=site_key)
         logger.info(f"Found {len(jobs)} jobs on {site_key}")
         return jobs
     
@@ -150,14 +263,14 @@ class BrowserController:
             company = company_element.text.strip() if company_element else "Unknown Company"
             location = location_element.text.strip() if location_element else "Unknown Location"
             
-            return {
-                "title": title,
-                "company": company,
-                "location": location,
-                "url": job_url,
-                "source": source,
-                "description": None  # Will be populated in get_job_details
-            }
+            return Job(
+                title=title,
+                company=company,
+                location=location,
+                url=job_url,
+                source=source,
+                description=None  # Will be populated in get_job_details
+            )
         except Exception as e:
             logger.error(f"Error extracting job data: {e}")
             return None
@@ -168,8 +281,14 @@ class BrowserController:
             logger.warning("Job URL is missing, cannot get details")
             return job
         
+        with metrics.span("browser_job_details_ms", source=job.get("source")):
+            return self._get_job_details(job)
+
+    def _get_job_details(self, job):
+        """Load a job page and extract its description (see get_job_details)."""
         # Navigate to job page
         full_url = job["url"] if job["url"].startswith("http") else f"https://{job['source']}.com{job['url']}"
+        self._apply_resource_policy(job.get("source"))
         if not self.navigate_to(full_url):
             return job
         
@@ -182,44 +301,15 @@ class BrowserController:
             
             # Get the page HTML
             page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Try to find job description
-            # This is a best effort approach since different sites have different structures
-            description_element = None
-            
-            # Try common job description selectors
-            description_selectors = [
-                ".job-description",
-                "#job-description",
-                ".description",
-                ".job-details",
-                "section.description",
-                "[data-automation='jobDescriptionText']"
-            ]
-            
-            for selector in description_selectors:
-                description_element = soup.select_one(selector)
-                if description_element:
-                    break
-            
-            # If no specific element found, try to get the main content
-            if not description_element:
-                description_element = soup.select_one("main") or soup.select_one("article")
-            
-            # If still no description found, use the body element
-            if not description_element:
-                description_element = soup.body
-            
-            # Extract text
-            description = description_element.get_text(separator="\n", strip=True) if description_element else ""
+            with metrics.span("browser_parse_ms", site=job.get("source")):
+                description = self._extract_description(page_source)
             
             # Update job with description
             job["description"] = description
             
             # Highlight the description in the browser for visualization
             try:
-                desc_elem = self.driver.find_element(By.CSS_SELECTOR, description_selectors[0])
+                desc_elem = self.driver.find_element(By.CSS_SELECTOR, DESCRIPTION_SELECTORS[0])
                 self.driver.execute_script("arguments[0].style.backgroundColor='#FFFFCC'", desc_elem)
             except Exception:
                 pass
@@ -229,6 +319,30 @@ class BrowserController:
         
         return job
     
+    def _extract_description(self, page_source):
+        """Extract the job description text from a job page's HTML."""
+        soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Try to find job description
+        # This is a best effort approach since different sites have different structures
+        description_element = None
+        
+        for selector in DESCRIPTION_SELECTORS:
+            description_element = soup.select_one(selector)
+            if description_element:
+                break
+        
+        # If no specific element found, try to get the main content
+        if not description_element:
+            description_element = soup.select_one("main") or soup.select_one("article")
+        
+        # If still no description found, use the body element
+        if not description_element:
+            description_element = soup.body
+        
+        # Extract text
+        return description_element.get_text(separator="\n", strip=True) if description_element else ""
+    
     def start_processing_thread(self):
         """Start a background thread for processing jobs."""
         if self._processing_thread is not None and self._processing_thread.is_alive():
@@ -278,4 +392,77 @@ class BrowserController:
         try:
             return self.results_queue.get(timeout=timeout)
         except queue.Empty:
-            return None 
\ No newline at end of file
+            return None 
+
+class BrowserPool:
+    """
+    A fixed-size pool of BrowserController instances shared by concurrent callers.
+    Browsers are started lazily, so an idle pool costs nothing.
+    """
+    def __init__(self, size=2, headless=HEADLESS_BROWSER, block_resources=BLOCK_RESOURCES):
+        self.size = size
+        self.headless = headless
+        self.block_resources = block_resources
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._available = threading.Semaphore(size)
+        self._closed = False
+    
+    def acquire(self, timeout=None):
+        """Check out a browser, starting one if the pool is not yet full."""
+        if not self._available.acquire(timeout=timeout):
+            raise TimeoutError("No browser available in the pool")
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                try:
+                    return self._idle.get_nowait()
+                except queue.Empty:
+                    pass
+        if closed:
+            self._available.release()
+            raise RuntimeError("Browser pool is closed")
+        try:
+            controller = BrowserController(headless=self.headless, block_resources=self.block_resources)
+        except Exception:
+            self._available.release()
+            raise
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._all.append(controller)
+        if closed:
+            controller.close()
+            self._available.release()
+            raise RuntimeError("Browser pool is closed")
+        return controller
+    
+    def release(self, controller):
+        """Return a browser to the pool; after close() it is dropped instead."""
+        with self._lock:
+            if not self._closed:
+                self._idle.put(controller)
+        self._available.release()
+    
+    @contextmanager
+    def browser(self, timeout=None):
+        """Context manager form of acquire()/release()."""
+        controller = self.acquire(timeout)
+        try:
+            yield controller
+        finally:
+            self.release(controller)
+    
+    def close(self):
+        """Quit every browser started by the pool; it hands out no more browsers."""
+        with self._lock:
+            self._closed = True
+            controllers, self._all = self._all, []
+            while not self._idle.empty():
+                self._idle.get_nowait()
+        for controller in controllers:
+            try:
+                controller.close()
+            except Exception as e:
+                logger.error(f"Error closing pooled browser: {e}")
@@ -12,14 +12,72 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # Configuration
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
 HEADLESS_BROWSER = os.getenv("HEADLESS_BROWSER", "True").lower() in ("true", "1", "t")
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "True").lower() in ("true", "1", "t")
+
+# Prompt compaction: trim job descriptions to a per-method token budget before LLM calls
+COMPACT_PROMPTS = os.getenv("COMPACT_PROMPTS", "True").lower() in ("true", "1", "t")
+PROMPT_TOKEN_BUDGETS = {
+    "extract_skills": 1200,
+    "calculate_job_match": 1000,
+    "generate_application_tips": 1500,
+}
+
+# Near-duplicate detection across job sources (MinHash + LSH)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "True").lower() in ("true", "1", "t")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# Search result cache: seconds a crawl's results are reused for the same
+# (site, query, location); a JOB_SITES entry may override with "cache_ttl"
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_MEMORY_ENTRIES = 256
+
+# Instrumentation
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").lower() in ("true", "1", "t")
+# Port of the /metrics server started by the dashboard and the reminder service
+# when METRICS_ENABLED is set (the API serves /metrics itself); give each
+# process on a host its own port
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+# HTTP API (src/api.py)
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_DB_POOL_SIZE = int(os.getenv("API_DB_POOL_SIZE", "16"))
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+# Seconds read endpoints serve cached responses; any write for the user clears them
+API_CACHE_TTL = float(os.getenv("API_CACHE_TTL", "30"))
+# Finished background tasks kept for status polling
+API_TASK_HISTORY = 1000
+
+# Streamlit dashboard (src/streamlit_app.py)
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+# Upper bound on how long cached views live; writes invalidate them sooner
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "600"))
+# Idle SQLite connections the dashboard process keeps for reuse across reruns
+DASHBOARD_DB_POOL_SIZE = int(os.getenv("DASHBOARD_DB_POOL_SIZE", "4"))
 
 # Database
 DB_PATH = os.getenv("DB_PATH", "./data/jobtracker.db")
 BASE_DIR = Path(__file__).resolve().parent.parent
+# Idle SQLite connections kept for reuse; 0 opens a connection per call
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "0"))
+# Number of SQLite files users are hash-partitioned across; 0 or 1 keeps a
+# single DB_PATH file. Shard files live next to DB_PATH (see src/sharding.py).
+DB_SHARDS = int(os.getenv("DB_SHARDS", "0"))
+# Fixed number of slots users hash into; slots, not users, are assigned to
+# shards, so it bounds the shard count and cannot change once data exists
+SHARD_SLOTS = 1024
 
 # Create data directory if it doesn't exist
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+# Application tracking
+# Statuses that count as an employer response to an application
+RESPONSE_STATUSES = ("interview", "interviewing", "rejected", "offer", "accepted")
+# Days without a response after applying before a follow-up reminder is due
+FOLLOW_UP_AFTER_DAYS = int(os.getenv("FOLLOW_UP_AFTER_DAYS", "7"))
+
 # Job Search Sites
 JOB_SITES = {
     "linkedin": {
@@ -28,6 +86,8 @@ JOB_SITES = {
         "job_title_selector": ".base-search-card__title",
         "company_selector": ".base-search-card__subtitle",
         "location_selector": ".job-search-card__location",
+        # Patterns from BLOCKED_URL_PATTERNS to leave unblocked on this site
+        "allowed_resources": [],
     },
     "indeed": {
         "url": "https://www.indeed.com/jobs?q={query}&l={location}",
@@ -35,6 +95,7 @@ JOB_SITES = {
         "job_title_selector": ".jobTitle",
         "company_selector": ".companyName",
         "location_selector": ".companyLocation",
+        "allowed_resources": [],
     },
     "glassdoor": {
         "url": "https://www.glassdoor.com/Job/jobs.htm?sc.keyword={query}&locT=C&locId=1147401",
@@ -42,9 +103,32 @@ JOB_SITES = {
         "job_title_selector": ".job-title",
         "company_selector": ".employer-name",
         "location_selector": ".location",
+        # Employer ratings in listing cards are drawn with SVG sprites
+        "allowed_resources": ["*.svg"],
     }
 }
 
+# Resources never parsed by the scraper; blocked in the browser via CDP
+# Network.setBlockedURLs (Chrome wildcard patterns)
+BLOCKED_URL_PATTERNS = [
+    # Images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.mp4", "*.webm",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Analytics, ads and tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*",
+    "*connect.facebook.com*", "*hotjar.com*", "*segment.io*", "*cdn.segment.com*",
+    "*optimizely.com*", "*newrelic.com*", "*nr-data.net*", "*scorecardresearch.com*",
+    "*quantserve.com*", "*bing.com/bat*", "*ads.linkedin.com*", "*px.ads.linkedin.com*",
+]
+
+# Number of recent per-page load reports kept by BrowserController
+PAGE_STATS_HISTORY = 1000
+# Seconds navigate_to waits for the load event before reading page stats;
+# only when metrics are enabled, otherwise the stats are read once without waiting
+PAGE_STATS_WAIT = float(os.getenv("PAGE_STATS_WAIT", "1.0"))
+
 # User-agent strings for web requests
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -1,16 +1,189 @@
 import sqlite3
 import os
-from datetime import datetime
-from src.config import DB_PATH
+import zlib
+import queue
+import threading
+from datetime import datetime, date
+from src.config import DB_PATH, DB_POOL_SIZE, DB_SHARDS, RESPONSE_STATUSES, DEDUP_ENABLED, DEDUP_THRESHOLD
+from src.metrics import metrics
+from src.models import Job, JobSkill
+from src.dedup import default_hasher, shingles, similarity, lsh_buckets, pack_signature, unpack_signature
+from src.exporter import export_columns, open_writer, format_for_path, FORMATS
+
+def to_timestamp(value):
+    """
+    Normalize a due date to integer epoch seconds.
+    Accepts datetimes, dates, epoch numbers and ISO-8601 strings ("2025-03-01",
+    "2025-03-01 09:30", "2025-03-01T09:30:00Z"). Naive values are local time.
+    Returns None for empty or unparseable input.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day).timestamp())
+    
+    text = str(value).strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return int(datetime.fromisoformat(text).timestamp())
+    except ValueError:
+        pass
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+class _PooledConnection:
+    """Proxy for a pooled sqlite3 connection; close() hands it back to the pool."""
+    __slots__ = ("_pool", "_conn")
+    
+    def __init__(self, pool, conn):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+    
+    def close(self):
+        self._pool.release(self._conn)
+
+class ConnectionPool:
+    """
+    Keeps up to `size` idle SQLite connections for reuse, so each Database
+    call skips opening a connection. Connections may move between threads
+    but are only used by one caller at a time, and run in WAL mode so
+    readers do not block the writer.
+    """
+    def __init__(self, db_path, size):
+        self.db_path = db_path
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+    
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def acquire(self):
+        """Get a connection, opening a new one if none are idle."""
+        try:
+            conn = self._idle.get_nowait()
+            metrics.inc("db_pool_reuse_total")
+        except queue.Empty:
+            conn = self._open()
+            metrics.inc("db_pool_open_total")
+        return _PooledConnection(self, conn)
+    
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full."""
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = None
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+def user_hash(username):
+    """Stable hash of a username; modulo the slot count it gives the user's shard slot."""
+    return zlib.crc32(username.encode("utf-8"))
 
 class Database:
-    def __init__(self, db_path=DB_PATH):
+    def __new__(cls, db_path=DB_PATH, pool_size=DB_POOL_SIZE, shards=DB_SHARDS, id_slots=1):
+        # Database(...) with more than one shard builds the router instead
+        if cls is Database and shards > 1:
+            from src.sharding import ShardedDatabase
+            return super().__new__(ShardedDatabase)
+        return super().__new__(cls)
+    
+    def __init__(self, db_path=DB_PATH, pool_size=DB_POOL_SIZE, shards=DB_SHARDS, id_slots=1):
+        """
+        `id_slots` > 1 is used for the files of a sharded store: new row ids
+        are allocated so that id % id_slots is the owning user's slot, which
+        lets the router find a job, reminder or skill from its id alone and
+        keeps ids unique across files.
+        """
         self.db_path = db_path
+        self.id_slots = id_slots
+        self._listeners = []
+        self._pool = ConnectionPool(db_path, pool_size) if pool_size > 0 else None
         self._create_tables()
     
+    def _new_id(self, table):
+        """
+        SQL for the id of a new row, taking the row's slot as its one parameter
+        (see _slot). Without slots this is NULL and SQLite picks the id. Runs
+        inside the INSERT, so under the write lock.
+        """
+        if self.id_slots == 1:
+            return "?"
+        # The smallest id above the current maximum that falls in the slot
+        n = self.id_slots
+        return f"(SELECT m + ((? - m) % {n} + {n}) % {n} FROM (SELECT COALESCE(MAX(id), 0) + 1 AS m FROM {table}))"
+    
+    def _slot(self, key):
+        """Parameter for _new_id: the slot of a user or row id, or None without slots."""
+        return None if self.id_slots == 1 else key % self.id_slots
+    
+    def _connect(self):
+        """Get a connection, from the pool when pooling is enabled."""
+        if self._pool is not None:
+            return self._pool.acquire()
+        return sqlite3.connect(self.db_path)
+    
+    def close(self):
+        """Release pooled connections."""
+        if self._pool is not None:
+            self._pool.close()
+    
+    def add_listener(self, callback):
+        """
+        Register a callback(event, payload) invoked after a write commits.
+        Events: "reminder_added", "reminder_completed", "job_status_changed".
+        """
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Unregister a change listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, event, payload):
+        """Deliver a change notification to all listeners."""
+        for callback in list(self._listeners):
+            try:
+                callback(event, payload)
+            except Exception as e:
+                print(f"Error in database listener for {event}: {e}")
+    
+    def _ensure_columns(self, cursor, table, columns):
+        """Add any missing columns to an existing table."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    
     def _create_tables(self):
         """Create necessary database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Create users table
@@ -100,21 +273,175 @@ class Database:
         )
         ''')
         
+        # Normalized due time (epoch seconds) and delivery marker for the reminder scheduler
+        self._ensure_columns(cursor, "reminders", {"due_at": "INTEGER", "notified_at": "INTEGER"})
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_pending
+        ON reminders (due_at, id) WHERE notified_at IS NULL AND completed = 0
+        ''')
+        
+        # Backfill due_at for reminders stored before the column existed
+        cursor.execute("SELECT id, due_date FROM reminders WHERE due_at IS NULL AND due_date IS NOT NULL")
+        backfill = [(to_timestamp(due_date), reminder_id) for reminder_id, due_date in cursor.fetchall()]
+        cursor.executemany("UPDATE reminders SET due_at = ? WHERE id = ?", [row for row in backfill if row[0] is not None])
+        
+        # Follow-up reminders generated from status events carry their rule and source event
+        self._ensure_columns(cursor, "reminders", {"rule": "TEXT", "event_id": "INTEGER"})
+        cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_reminders_rule_event
+        ON reminders (event_id, rule) WHERE event_id IS NOT NULL
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_job ON reminders (job_id)")
+        
+        # Append-only history of job status changes
+        self._ensure_columns(cursor, "jobs", {"status_changed_at": "INTEGER"})
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_status_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            from_status TEXT,
+            to_status TEXT NOT NULL,
+            changed_at INTEGER NOT NULL,
+            FOREIGN KEY (job_id) REFERENCES jobs (id),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_status_events_job ON job_status_events (job_id)")
+        
+        # Funnel aggregates, maintained incrementally by add_job/update_job_status
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS status_funnel (
+            user_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            entered INTEGER NOT NULL DEFAULT 0,
+            exited INTEGER NOT NULL DEFAULT 0,
+            seconds_in_stage INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, status)
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS status_transitions (
+            user_id INTEGER NOT NULL,
+            from_status TEXT NOT NULL,
+            to_status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, from_status, to_status)
+        )
+        ''')
+        
+        # Near-duplicate index: MinHash signatures and banded LSH buckets per user
+        self._ensure_columns(cursor, "jobs", {"canonical_job_id": "INTEGER"})
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_canonical
+        ON jobs (canonical_job_id) WHERE canonical_job_id IS NOT NULL
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_signatures (
+            job_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            signature BLOB NOT NULL,
+            FOREIGN KEY (job_id) REFERENCES jobs (id)
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_lsh (
+            user_id INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_lsh_bucket ON job_lsh (user_id, bucket)")
+        
+        # Search timings and cache hits, plus the shared search result cache
+        self._ensure_columns(cursor, "search_history", {
+            "site": "TEXT",
+            "duration_ms": "REAL",
+            "cache_hit": "BOOLEAN DEFAULT FALSE",
+            "coalesced": "BOOLEAN DEFAULT FALSE",
+        })
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_cache (
+            site TEXT NOT NULL,
+            query_key TEXT NOT NULL,
+            location_key TEXT NOT NULL,
+            results TEXT NOT NULL,
+            results_count INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (site, query_key, location_key)
+        )
+        ''')
+        
+        # Small key/value store for internal bookkeeping (e.g. follow-up engine cursor)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS db_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        )
+        ''')
+        
+        # Dashboard summaries, maintained incrementally by the writes they count
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skill_counts (
+            user_id INTEGER NOT NULL,
+            skill TEXT NOT NULL COLLATE NOCASE,
+            jobs INTEGER NOT NULL DEFAULT 0,
+            required INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, skill)
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS source_yield (
+            user_id INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            jobs INTEGER NOT NULL DEFAULT 0,
+            applied INTEGER NOT NULL DEFAULT 0,
+            responses INTEGER NOT NULL DEFAULT 0,
+            offers INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, source)
+        )
+        ''')
+        # Per-user write counter; readers can cache anything keyed on (user_id, version)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        ''')
+        # Per-user job listing and keyset pagination (rowid order within each index entry)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user_status ON jobs (user_id, status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills (job_id)")
+        
+        # Seed the funnel from current statuses for jobs stored before it existed
+        cursor.execute("SELECT 1 FROM status_funnel LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute('''
+            INSERT INTO status_funnel (user_id, status, entered)
+            SELECT user_id, status, COUNT(*) FROM jobs GROUP BY user_id, status
+            ''')
+        
+        # Likewise for the dashboard summaries
+        cursor.execute("SELECT 1 FROM source_yield LIMIT 1")
+        if cursor.fetchone() is None:
+            self._rebuild_summaries(cursor)
+        
         conn.commit()
         conn.close()
     
     def add_user(self, username, email, password_hash):
         """Add a new user to the database."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
             cursor.execute(
-                "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
-                (username, email, password_hash)
+                f"INSERT INTO users (id, username, email, password_hash) VALUES ({self._new_id('users')}, ?, ?, ?)",
+                (self._slot(user_hash(username)), username, email, password_hash)
             )
             user_id = cursor.lastrowid
-            conn.commit()
+            with metrics.span("db_commit_ms", method="add_user"):
+                conn.commit()
             return user_id
         except sqlite3.IntegrityError:
             conn.rollback()
@@ -122,20 +449,46 @@ class Database:
         finally:
             conn.close()
     
-    def add_job(self, user_id, title, company, location, description, url, source, match_score=None):
-        """Add a new job to the database."""
-        conn = sqlite3.connect(self.db_path)
+    def add_job(self, user_id, title, company, location, description, url, source, match_score=None, dedup=DEDUP_ENABLED):
+        """
+        Add a new job to the database.
+        With dedup enabled, a near-duplicate of one of the user's existing jobs
+        (e.g. the same role in the same place on another site) is linked to it
+        through canonical_job_id and inherits its match score and skills.
+        Only jobs that both have a description are linked: title, company and
+        location alone do not tell two openings apart.
+        """
+        signature = buckets = None
+        if dedup:
+            with metrics.span("dedup_signature_ms"):
+                signature = default_hasher.signature(shingles(title, company, description, location=location))
+                buckets = lsh_buckets(signature)
+        
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
+            canonical_job_id = None
+            if dedup and description:
+                duplicate = self._find_duplicate(cursor, user_id, signature, buckets)
+                if duplicate:
+                    canonical_job_id, canonical_score = duplicate
+                    if match_score is None:
+                        match_score = canonical_score
+            
             cursor.execute(
-                """INSERT INTO jobs 
-                   (user_id, title, company, location, description, url, source, match_score) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (user_id, title, company, location, description, url, source, match_score)
+                f"""INSERT INTO jobs 
+                    (id, user_id, title, company, location, description, url, source, match_score, canonical_job_id) 
+                    VALUES ({self._new_id('jobs')}, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (self._slot(user_id), user_id, title, company, location, description, url, source, match_score, canonical_job_id)
             )
             job_id = cursor.lastrowid
-            conn.commit()
+            if dedup:
+                self._index_signature(cursor, job_id, user_id, signature, buckets)
+            self._record_status_change(cursor, job_id, user_id, None, "discovered", None)
+            self._touch(cursor, user_id)
+            with metrics.span("db_commit_ms", method="add_job"):
+                conn.commit()
             return job_id
         except Exception as e:
             conn.rollback()
@@ -144,12 +497,219 @@ class Database:
         finally:
             conn.close()
     
+    def _find_duplicate(self, cursor, user_id, signature, buckets, exclude_job_id=None):
+        """
+        Look up a near-duplicate of a signature among the user's indexed jobs
+        that have a description. Candidates sharing the most LSH buckets are
+        compared first; on equal similarity the oldest canonical job wins.
+        Returns (canonical_job_id, canonical_match_score) or None.
+        """
+        with metrics.span("dedup_lookup_ms"):
+            placeholders = ", ".join(["?"] * len(buckets))
+            cursor.execute(
+                f"""SELECT job_id FROM job_lsh 
+                    WHERE user_id = ? AND bucket IN ({placeholders}) 
+                    GROUP BY job_id ORDER BY COUNT(*) DESC, job_id LIMIT 200""",
+                [user_id] + buckets
+            )
+            candidate_ids = [row[0] for row in cursor.fetchall() if row[0] != exclude_job_id]
+            if not candidate_ids:
+                return None
+            
+            placeholders = ", ".join(["?"] * len(candidate_ids))
+            cursor.execute(
+                f"""SELECT s.job_id, s.signature, COALESCE(j.canonical_job_id, j.id) 
+                    FROM job_signatures s JOIN jobs j ON j.id = s.job_id 
+                    WHERE s.job_id IN ({placeholders}) AND j.description IS NOT NULL AND j.description != ''""",
+                candidate_ids
+            )
+            best_score, best_canonical = 0.0, None
+            for _, blob, canonical_id in cursor.fetchall():
+                score = similarity(signature, unpack_signature(blob))
+                if score > best_score or (score == best_score and best_canonical is not None and canonical_id < best_canonical):
+                    best_score, best_canonical = score, canonical_id
+            
+            if best_canonical is None or best_score < DEDUP_THRESHOLD:
+                return None
+            cursor.execute("SELECT match_score FROM jobs WHERE id = ?", (best_canonical,))
+            row = cursor.fetchone()
+        
+        metrics.inc("dedup_duplicates_total")
+        return best_canonical, row[0] if row else None
+    
+    def _index_signature(self, cursor, job_id, user_id, signature, buckets):
+        """Store a job's MinHash signature and LSH buckets."""
+        cursor.execute(
+            "INSERT OR REPLACE INTO job_signatures (job_id, user_id, signature) VALUES (?, ?, ?)",
+            (job_id, user_id, pack_signature(signature))
+        )
+        cursor.executemany(
+            "INSERT INTO job_lsh (user_id, bucket, job_id) VALUES (?, ?, ?)",
+            [(user_id, bucket, job_id) for bucket in buckets]
+        )
+    
+    def find_duplicate(self, user_id, title, company, description=None, location=None):
+        """
+        Find the canonical job a posting would be linked to, without storing it.
+        Useful to skip AI scoring for postings already seen on another site.
+        Postings without a description are never linked.
+        """
+        if not description:
+            return None
+        signature = default_hasher.signature(shingles(title, company, description, location=location))
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            duplicate = self._find_duplicate(cursor, user_id, signature, lsh_buckets(signature))
+        finally:
+            conn.close()
+        
+        if not duplicate:
+            return None
+        return self.get_jobs_by_ids([duplicate[0]]).get(duplicate[0])
+    
+    def rebuild_duplicate_index(self, user_id=None, batch_size=1000):
+        """
+        Index jobs stored before near-duplicate detection existed, linking any
+        duplicates among them. Returns the number of jobs indexed.
+        """
+        indexed = 0
+        last_id = 0
+        while True:
+            conn = self._connect()
+            cursor = conn.cursor()
+            try:
+                query = """SELECT j.id, j.user_id, j.title, j.company, j.location, j.description FROM jobs j 
+                           LEFT JOIN job_signatures s ON s.job_id = j.id 
+                           WHERE s.job_id IS NULL AND j.id > ?"""
+                params = [last_id]
+                if user_id is not None:
+                    query += " AND j.user_id = ?"
+                    params.append(user_id)
+                cursor.execute(query + " ORDER BY j.id LIMIT ?", params + [batch_size])
+                rows = cursor.fetchall()
+                if not rows:
+                    return indexed
+                
+                for job_id, job_user_id, title, company, location, description in rows:
+                    signature = default_hasher.signature(shingles(title, company, description, location=location))
+                    buckets = lsh_buckets(signature)
+                    duplicate = None
+                    if description:
+                        duplicate = self._find_duplicate(cursor, job_user_id, signature, buckets, exclude_job_id=job_id)
+                    if duplicate:
+                        cursor.execute(
+                            "UPDATE jobs SET canonical_job_id = ?, match_score = COALESCE(match_score, ?) WHERE id = ?",
+                            (duplicate[0], duplicate[1], job_id)
+                        )
+                    self._index_signature(cursor, job_id, job_user_id, signature, buckets)
+                    last_id = job_id
+                
+                with metrics.span("db_commit_ms", method="rebuild_duplicate_index"):
+                    conn.commit()
+                indexed += len(rows)
+            except Exception as e:
+                conn.rollback()
+                print(f"Error rebuilding duplicate index: {e}")
+                return indexed
+            finally:
+                conn.close()
+    
+    def set_match_score(self, job_id, match_score):
+        """Set a job's match score, sharing it with every duplicate linked to the job."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                "UPDATE jobs SET match_score = ? WHERE id = ? OR canonical_job_id = ?",
+                (match_score, job_id, job_id)
+            )
+            self._touch_job_owner(cursor, job_id)
+            with metrics.span("db_commit_ms", method="set_match_score"):
+                conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Error setting match score: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def _record_status_change(self, cursor, job_id, user_id, from_status, to_status, entered_at, changed_at=None):
+        """
+        Append a status event and update the funnel and per-source aggregates.
+        Must run inside the transaction that changes the job's status.
+        """
+        changed_at = int(changed_at if changed_at is not None else datetime.now().timestamp())
+        cursor.execute(
+            "UPDATE jobs SET status_changed_at = ? WHERE id = ?",
+            (changed_at, job_id)
+        )
+        cursor.execute(
+            f"""INSERT INTO job_status_events 
+                (id, job_id, user_id, from_status, to_status, changed_at) 
+                VALUES ({self._new_id('job_status_events')}, ?, ?, ?, ?, ?)""",
+            (self._slot(user_id), job_id, user_id, from_status, to_status, changed_at)
+        )
+        event_id = cursor.lastrowid
+        
+        cursor.execute(
+            """INSERT INTO status_funnel (user_id, status, entered) VALUES (?, ?, 1)
+               ON CONFLICT (user_id, status) DO UPDATE SET entered = entered + 1""",
+            (user_id, to_status)
+        )
+        if from_status is not None:
+            seconds = max(0, changed_at - entered_at) if entered_at is not None else 0
+            cursor.execute(
+                """INSERT INTO status_funnel (user_id, status, exited, seconds_in_stage) VALUES (?, ?, 1, ?)
+                   ON CONFLICT (user_id, status) DO UPDATE 
+                   SET exited = exited + 1, seconds_in_stage = seconds_in_stage + excluded.seconds_in_stage""",
+                (user_id, from_status, seconds)
+            )
+            cursor.execute(
+                """INSERT INTO status_transitions (user_id, from_status, to_status, count) VALUES (?, ?, ?, 1)
+                   ON CONFLICT (user_id, from_status, to_status) DO UPDATE SET count = count + 1""",
+                (user_id, from_status, to_status)
+            )
+        
+        # Same definitions as _rebuild_summaries: applications and offers are
+        # entries into those statuses, responses are moves out of 'applied'
+        new_job = int(from_status is None)
+        applied = int(to_status == "applied")
+        response = int(from_status == "applied" and to_status in RESPONSE_STATUSES)
+        offer = int(to_status == "offer")
+        if new_job or applied or response or offer:
+            cursor.execute(
+                """INSERT INTO source_yield (user_id, source, jobs, applied, responses, offers) 
+                   SELECT user_id, COALESCE(source, 'unknown'), ?, ?, ?, ? FROM jobs WHERE id = ? 
+                   ON CONFLICT (user_id, source) DO UPDATE 
+                   SET jobs = jobs + excluded.jobs, applied = applied + excluded.applied, 
+                       responses = responses + excluded.responses, offers = offers + excluded.offers""",
+                (new_job, applied, response, offer, job_id)
+            )
+        return event_id
+    
     def update_job_status(self, job_id, status, applied_date=None):
-        """Update job application status."""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Update job application status.
+        The change is recorded in job_status_events and the funnel aggregates
+        in the same transaction.
+        """
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
+            cursor.execute(
+                "SELECT user_id, status, status_changed_at, created_at FROM jobs WHERE id = ?",
+                (job_id,)
+            )
+            current = cursor.fetchone()
+            if current is None:
+                return False
+            user_id, from_status, status_changed_at, created_at = current
+            
             if applied_date and status == 'applied':
                 cursor.execute(
                     "UPDATE jobs SET status = ?, applied_date = ? WHERE id = ?",
@@ -160,47 +720,547 @@ class Database:
                     "UPDATE jobs SET status = ? WHERE id = ?",
                     (status, job_id)
                 )
-            conn.commit()
-            return True
+            
+            event_id = None
+            if status != from_status:
+                # created_at is stored by SQLite as UTC
+                entered_at = status_changed_at if status_changed_at is not None else to_timestamp(f"{created_at}+00:00")
+                event_id = self._record_status_change(cursor, job_id, user_id, from_status, status, entered_at)
+            self._touch(cursor, user_id)
+            
+            with metrics.span("db_commit_ms", method="update_job_status"):
+                conn.commit()
         except Exception as e:
             conn.rollback()
             print(f"Error updating job status: {e}")
             return False
         finally:
             conn.close()
+        
+        if event_id is not None:
+            self._notify("job_status_changed", {
+                "event_id": event_id, "job_id": job_id, "user_id": user_id,
+                "from_status": from_status, "to_status": status,
+            })
+        return True
     
-    def get_jobs_by_user(self, user_id, status=None):
-        """Get all jobs for a specific user, optionally filtered by status."""
-        conn = sqlite3.connect(self.db_path)
+    def get_status_events(self, after_id=0, limit=500, job_id=None):
+        """Get status events in id order, either after a cursor or for a single job."""
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         try:
-            if status:
+            if job_id is not None:
                 cursor.execute(
-                    "SELECT * FROM jobs WHERE user_id = ? AND status = ? ORDER BY created_at DESC",
-                    (user_id, status)
+                    "SELECT * FROM job_status_events WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+                    (job_id, after_id, limit)
                 )
             else:
                 cursor.execute(
-                    "SELECT * FROM jobs WHERE user_id = ? ORDER BY created_at DESC",
-                    (user_id,)
+                    "SELECT * FROM job_status_events WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, limit)
                 )
             return [dict(row) for row in cursor.fetchall()]
         finally:
             conn.close()
     
+    def get_status_funnel(self, user_id):
+        """
+        Get funnel analytics for a user from the incrementally maintained aggregates:
+        per-status counts, average days in each stage and the response rate of applications.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                "SELECT status, entered, exited, seconds_in_stage FROM status_funnel WHERE user_id = ?",
+                (user_id,)
+            )
+            stages = {}
+            for status, entered, exited, seconds_in_stage in cursor.fetchall():
+                stages[status] = {
+                    "entered": entered,
+                    "exited": exited,
+                    "current": entered - exited,
+                    "avg_days_in_stage": round(seconds_in_stage / exited / 86400.0, 2) if exited else None,
+                }
+            
+            cursor.execute(
+                "SELECT from_status, to_status, count FROM status_transitions WHERE user_id = ?",
+                (user_id,)
+            )
+            transitions = [
+                {"from": from_status, "to": to_status, "count": count}
+                for from_status, to_status, count in cursor.fetchall()
+            ]
+            
+            applied = stages.get("applied", {}).get("entered", 0)
+            responses = sum(
+                t["count"] for t in transitions
+                if t["from"] == "applied" and t["to"] in RESPONSE_STATUSES
+            )
+            return {
+                "stages": stages,
+                "transitions": transitions,
+                "applied": applied,
+                "responses": responses,
+                "response_rate": round(responses / applied, 4) if applied else None,
+            }
+        finally:
+            conn.close()
+    
+    def _touch(self, cursor, user_id):
+        """Bump a user's data version. Must run inside the writing transaction."""
+        cursor.execute(
+            """INSERT INTO data_versions (user_id, version) VALUES (?, 1) 
+               ON CONFLICT (user_id) DO UPDATE SET version = version + 1""",
+            (user_id,)
+        )
+    
+    def _touch_job_owner(self, cursor, job_id):
+        """Bump the data version of the user owning a job."""
+        cursor.execute(
+            """INSERT INTO data_versions (user_id, version) SELECT user_id, 1 FROM jobs WHERE id = ? 
+               ON CONFLICT (user_id) DO UPDATE SET version = version + 1""",
+            (job_id,)
+        )
+    
+    def _count_skills(self, cursor, job_id, skills):
+        """Add (skill, required) pairs attached to a job to the skill_counts summary."""
+        cursor.executemany(
+            """INSERT INTO skill_counts (user_id, skill, jobs, required) 
+               SELECT user_id, ?, 1, ? FROM jobs WHERE id = ? 
+               ON CONFLICT (user_id, skill) DO UPDATE 
+               SET jobs = jobs + 1, required = required + excluded.required""",
+            [(skill, int(bool(required)), job_id) for skill, required in skills]
+        )
+    
+    def _rebuild_summaries(self, cursor):
+        """Recompute skill_counts and source_yield from the base tables."""
+        cursor.execute("DELETE FROM skill_counts")
+        cursor.execute('''
+        INSERT INTO skill_counts (user_id, skill, jobs, required)
+        SELECT j.user_id, s.skill, COUNT(*), SUM(s.required) 
+        FROM job_skills s JOIN jobs j ON j.id = s.job_id 
+        GROUP BY j.user_id, s.skill COLLATE NOCASE
+        ''')
+        
+        # Counted from job_status_events exactly as _record_status_change counts
+        # them; jobs with no recorded history (e.g. bulk-loaded with plain SQL)
+        # are assumed to have reached their status by way of 'applied'
+        responded = ", ".join(["?"] * len(RESPONSE_STATUSES))
+        cursor.execute("DELETE FROM source_yield")
+        cursor.execute(f'''
+        INSERT INTO source_yield (user_id, source, jobs, applied, responses, offers)
+        SELECT j.user_id, COALESCE(j.source, 'unknown'), COUNT(*), 
+               SUM(CASE WHEN e.job_id IS NULL THEN j.status = 'applied' OR j.status IN ({responded}) 
+                   ELSE e.applied END), 
+               SUM(CASE WHEN e.job_id IS NULL THEN j.status IN ({responded}) ELSE e.responses END), 
+               SUM(CASE WHEN e.job_id IS NULL THEN j.status IN ('offer', 'accepted') ELSE e.offers END) 
+        FROM jobs j LEFT JOIN (
+            SELECT job_id, SUM(to_status = 'applied') AS applied, 
+                   SUM(from_status = 'applied' AND to_status IN ({responded})) AS responses, 
+                   SUM(to_status = 'offer') AS offers 
+            FROM job_status_events GROUP BY job_id
+        ) e ON e.job_id = j.id 
+        GROUP BY j.user_id, COALESCE(j.source, 'unknown')
+        ''', RESPONSE_STATUSES * 3)
+        
+        cursor.execute("""INSERT INTO data_versions (user_id, version) SELECT id, 1 FROM users WHERE true 
+                          ON CONFLICT (user_id) DO UPDATE SET version = version + 1""")
+    
+    def rebuild_summaries(self):
+        """
+        Recompute the dashboard summaries, e.g. after bulk-loading rows with
+        plain SQL. Funnel rows are seeded for users that have none.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+            INSERT INTO status_funnel (user_id, status, entered)
+            SELECT user_id, status, COUNT(*) FROM jobs 
+            WHERE user_id NOT IN (SELECT user_id FROM status_funnel) 
+            GROUP BY user_id, status
+            ''')
+            self._rebuild_summaries(cursor)
+            with metrics.span("db_commit_ms", method="rebuild_summaries"):
+                conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Error rebuilding summaries: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def get_data_version(self, user_id):
+        """Current data version of a user; it changes whenever the user's data is written."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT version FROM data_versions WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+    
+    def get_skill_frequency(self, user_id, limit=20):
+        """Most frequent skills across a user's jobs, from the skill_counts summary."""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """SELECT skill, jobs, required FROM skill_counts 
+                   WHERE user_id = ? ORDER BY jobs DESC, skill LIMIT ?""",
+                (user_id, limit)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    
+    def get_source_yield(self, user_id):
+        """
+        Per-source yield: jobs found on each site, and how many were applied to,
+        got a response and reached an offer.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """SELECT source, jobs, applied, responses, offers FROM source_yield 
+                   WHERE user_id = ? ORDER BY jobs DESC""",
+                (user_id,)
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+            for row in rows:
+                row["response_rate"] = round(row["responses"] / row["applied"], 4) if row["applied"] else None
+            return rows
+        finally:
+            conn.close()
+    
+    def get_overview(self):
+        """
+        Totals across all users from the summary tables: users, current jobs
+        per status, applications, responses, offers and pending reminders.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            with metrics.span("db_query_ms", method="get_overview"):
+                cursor.execute("SELECT COUNT(*) FROM users")
+                users = cursor.fetchone()[0]
+                cursor.execute("SELECT status, SUM(entered - exited) FROM status_funnel GROUP BY status")
+                statuses = {status: count for status, count in cursor.fetchall()}
+                cursor.execute("SELECT SUM(jobs), SUM(applied), SUM(responses), SUM(offers) FROM source_yield")
+                jobs, applied, responses, offers = (value or 0 for value in cursor.fetchone())
+                cursor.execute("SELECT COUNT(*) FROM reminders WHERE notified_at IS NULL AND completed = 0")
+                pending_reminders = cursor.fetchone()[0]
+            return {
+                "users": users,
+                "jobs": jobs,
+                "statuses": statuses,
+                "applied": applied,
+                "responses": responses,
+                "offers": offers,
+                "pending_reminders": pending_reminders,
+                "response_rate": round(responses / applied, 4) if applied else None,
+            }
+        finally:
+            conn.close()
+    
+    def get_meta(self, key, default=None):
+        """Read an internal bookkeeping value."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT value FROM db_meta WHERE key = ?", (key,))
+            row = cursor.fetchone()
+            return row[0] if row else default
+        finally:
+            conn.close()
+    
+    def apply_follow_ups(self, reminders, cancel_job_ids, cursor_key, last_event_id):
+        """
+        Insert generated follow-up reminders, cancel stale pending follow-ups for
+        jobs whose status moved on, and advance the engine cursor, all in one transaction.
+        `reminders` are (user_id, job_id, title, description, due_at, rule, event_id) tuples.
+        Returns the number of reminders inserted, or None if the transaction failed.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        added = []
+        cancelled = []
+        
+        try:
+            if cancel_job_ids:
+                # Follow-ups of the events being applied are kept, so re-applying
+                # a batch (e.g. after a rebalance moved the events) changes nothing
+                keep = sorted({reminder[6] for reminder in reminders})
+                placeholders = ", ".join(["?"] * len(cancel_job_ids))
+                cursor.execute(
+                    f"""SELECT id FROM reminders 
+                        WHERE job_id IN ({placeholders}) AND rule IS NOT NULL 
+                          AND notified_at IS NULL AND completed = 0 
+                          AND event_id NOT IN ({', '.join(['?'] * len(keep))})""",
+                    list(cancel_job_ids) + keep
+                )
+                cancelled = [row[0] for row in cursor.fetchall()]
+                cursor.executemany("UPDATE reminders SET completed = 1 WHERE id = ?", [(rid,) for rid in cancelled])
+            
+            for user_id, job_id, title, description, due_at, rule, event_id in reminders:
+                cursor.execute(
+                    f"""INSERT OR IGNORE INTO reminders 
+                        (id, user_id, job_id, title, description, due_date, due_at, rule, event_id) 
+                        VALUES ({self._new_id('reminders')}, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (self._slot(user_id), user_id, job_id, title, description,
+                     datetime.fromtimestamp(due_at).isoformat(timespec="seconds"), due_at, rule, event_id)
+                )
+                if cursor.rowcount:
+                    added.append({
+                        "id": cursor.lastrowid, "user_id": user_id, "job_id": job_id, "title": title,
+                        "description": description, "due_at": due_at, "rule": rule, "event_id": event_id,
+                    })
+            
+            cursor.execute(
+                """INSERT INTO db_meta (key, value) VALUES (?, ?)
+                   ON CONFLICT (key) DO UPDATE SET value = excluded.value""",
+                (cursor_key, last_event_id)
+            )
+            with metrics.span("db_commit_ms", method="apply_follow_ups"):
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error applying follow-up reminders: {e}")
+            return None
+        finally:
+            conn.close()
+        
+        for reminder_id in cancelled:
+            self._notify("reminder_completed", {"id": reminder_id})
+        for reminder in added:
+            self._notify("reminder_added", reminder)
+        return len(added)
+    
+    def get_jobs_by_user(self, user_id, status=None):
+        """Get all jobs for a specific user, optionally filtered by status."""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            with metrics.span("db_query_ms", method="get_jobs_by_user"):
+                if status:
+                    cursor.execute(
+                        "SELECT * FROM jobs WHERE user_id = ? AND status = ? ORDER BY created_at DESC",
+                        (user_id, status)
+                    )
+                else:
+                    cursor.execute(
+                        "SELECT * FROM jobs WHERE user_id = ? ORDER BY created_at DESC",
+                        (user_id,)
+                    )
+                rows = cursor.fetchall()
+            return [Job.from_row(row) for row in rows]
+        finally:
+            conn.close()
+    
+    def get_jobs_page(self, user_id, status=None, source=None, before_id=None, limit=50):
+        """
+        Get one page of a user's jobs, newest first, without descriptions.
+        Pages are keyset-paginated on job id: pass the last id of a page as
+        `before_id` to get the next one, so deep pages cost the same as the first.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            query = """SELECT id, user_id, title, company, location, url, source, status, applied_date, 
+                              response_date, match_score, created_at, canonical_job_id 
+                       FROM jobs WHERE user_id = ?"""
+            params = [user_id]
+            if status:
+                query += " AND status = ?"
+                params.append(status)
+            if source:
+                query += " AND source = ?"
+                params.append(source)
+            if before_id is not None:
+                query += " AND id < ?"
+                params.append(before_id)
+            with metrics.span("db_query_ms", method="get_jobs_page"):
+                cursor.execute(query + " ORDER BY id DESC LIMIT ?", params + [limit])
+                rows = cursor.fetchall()
+            return [Job.from_row(row) for row in rows]
+        finally:
+            conn.close()
+    
+    def get_jobs_by_ids(self, job_ids):
+        """Get jobs by id, returned as a dict of id -> Job."""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        jobs = {}
+        
+        try:
+            job_ids = list(job_ids)
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                placeholders = ", ".join(["?"] * len(chunk))
+                cursor.execute(f"SELECT * FROM jobs WHERE id IN ({placeholders})", chunk)
+                for row in cursor.fetchall():
+                    jobs[row["id"]] = Job.from_row(row)
+            return jobs
+        finally:
+            conn.close()
+    
+    def iter_export_chunks(self, user_id=None, status=None, source=None, since=None, until=None,
+                           min_match_score=None, include_duplicates=True, description="include", chunk_size=10000):
+        """
+        Yield jobs joined with their skills as lists of row tuples, `chunk_size`
+        jobs at a time in id order, with columns as in export_columns(description).
+        Filters are applied in SQL; `status` may be a single status or a list.
+        `since`/`until` bound created_at ('YYYY-MM-DD[ HH:MM:SS]', until exclusive).
+        Each chunk is a separate keyset query, so no read transaction stays open
+        for the whole export.
+        """
+        columns = export_columns(description)
+        select = [f"j.{name}" for name, _ in columns if name not in ("description_zlib", "skills", "required_skills")]
+        if description == "compress":
+            select.append("j.description")
+        select += [
+            "group_concat(s.skill, char(31))",
+            "group_concat(CASE WHEN s.required THEN s.skill END, char(31))",
+        ]
+        
+        conditions = ["j.id > ?"]
+        params = []
+        if user_id is not None:
+            conditions.append("j.user_id = ?")
+            params.append(user_id)
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            conditions.append(f"j.status IN ({', '.join(['?'] * len(statuses))})")
+            params += statuses
+        if source:
+            conditions.append("j.source = ?")
+            params.append(source)
+        if since:
+            conditions.append("j.created_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("j.created_at < ?")
+            params.append(until)
+        if min_match_score is not None:
+            conditions.append("j.match_score >= ?")
+            params.append(min_match_score)
+        if not include_duplicates:
+            conditions.append("j.canonical_job_id IS NULL")
+        
+        query = f"""SELECT {', '.join(select)} FROM jobs j 
+                    LEFT JOIN job_skills s ON s.job_id = j.id 
+                    WHERE {' AND '.join(conditions)} 
+                    GROUP BY j.id ORDER BY j.id LIMIT ?"""
+        
+        last_id = 0
+        while True:
+            conn = self._connect()
+            cursor = conn.cursor()
+            try:
+                with metrics.span("db_query_ms", method="iter_export_chunks"):
+                    cursor.execute(query, [last_id] + params + [chunk_size])
+                    rows = cursor.fetchall()
+            finally:
+                conn.close()
+            if not rows:
+                return
+            
+            chunk = []
+            for row in rows:
+                *fields, skills, required_skills = row
+                if description == "compress":
+                    text = fields.pop()
+                    fields.append(zlib.compress(text.encode("utf-8")) if text else None)
+                fields.append(skills.split("\x1f") if skills else [])
+                fields.append(required_skills.split("\x1f") if required_skills else [])
+                chunk.append(fields)
+            last_id = rows[-1][0]
+            yield chunk
+            if len(rows) < chunk_size:
+                return
+    
+    def export_jobs(self, path, fmt=None, description="include", chunk_size=10000, **filters):
+        """
+        Stream jobs joined with their skills to a Parquet, Arrow IPC or CSV file.
+        Memory use is bounded by `chunk_size` rather than the number of jobs.
+        `fmt` defaults from the file extension; `description` is "include",
+        "exclude" or "compress" (zlib bytes in a description_zlib column,
+        base64 in CSV). Parquet and Arrow files are zstd-compressed already,
+        so "compress" mostly pays off for CSV. Other keyword arguments are
+        iter_export_chunks filters.
+        Returns export statistics, or None on failure.
+        """
+        fmt = fmt or format_for_path(path)
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+        
+        rows = chunks = 0
+        writer = None
+        start = datetime.now()
+        try:
+            with metrics.span("export_ms", format=fmt):
+                writer = open_writer(path, fmt, export_columns(description))
+                for chunk in self.iter_export_chunks(description=description, chunk_size=chunk_size, **filters):
+                    writer.write(chunk)
+                    rows += len(chunk)
+                    chunks += 1
+                writer.close()
+            metrics.inc("export_rows_total", rows, format=fmt)
+            return {
+                "path": path,
+                "format": fmt,
+                "rows": rows,
+                "chunks": chunks,
+                "bytes": os.path.getsize(path),
+                "seconds": round((datetime.now() - start).total_seconds(), 3),
+            }
+        except Exception as e:
+            print(f"Error exporting jobs: {e}")
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            if os.path.exists(path):
+                os.remove(path)
+            return None
+    
     def add_skill_to_job(self, job_id, skill, required=False):
         """Add a skill requirement to a job."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
             cursor.execute(
-                "INSERT INTO job_skills (job_id, skill, required) VALUES (?, ?, ?)",
-                (job_id, skill, required)
+                f"INSERT INTO job_skills (id, job_id, skill, required) VALUES ({self._new_id('job_skills')}, ?, ?, ?)",
+                (self._slot(job_id), job_id, skill, required)
             )
-            conn.commit()
+            self._count_skills(cursor, job_id, [(skill, required)])
+            self._touch_job_owner(cursor, job_id)
+            with metrics.span("db_commit_ms", method="add_skill_to_job"):
+                conn.commit()
             return True
         except Exception as e:
             conn.rollback()
@@ -209,41 +1269,162 @@ class Database:
         finally:
             conn.close()
     
+    def add_job_skills(self, job_id, skills):
+        """Add several JobSkill records to a job in a single transaction."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.executemany(
+                f"INSERT INTO job_skills (id, job_id, skill, required) VALUES ({self._new_id('job_skills')}, ?, ?, ?)",
+                [(self._slot(job_id), job_id, skill.skill, skill.required) for skill in skills]
+            )
+            self._count_skills(cursor, job_id, [(skill.skill, skill.required) for skill in skills])
+            self._touch_job_owner(cursor, job_id)
+            with metrics.span("db_commit_ms", method="add_job_skills"):
+                conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Error adding skills to job: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def get_job_skills(self, job_id):
+        """
+        Get all skills attached to a job.
+        A duplicate with no skills of its own reuses its canonical job's skills.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT * FROM job_skills WHERE job_id = ?", (job_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                cursor.execute(
+                    """SELECT s.* FROM job_skills s JOIN jobs j ON s.job_id = j.canonical_job_id 
+                       WHERE j.id = ?""",
+                    (job_id,)
+                )
+                rows = cursor.fetchall()
+            return [JobSkill.from_row(row) for row in rows]
+        finally:
+            conn.close()
+    
     def add_reminder(self, user_id, title, description=None, due_date=None, job_id=None):
         """Add a reminder for a user, optionally associated with a job."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        due_at = to_timestamp(due_date)
+        if isinstance(due_date, (datetime, date)):
+            due_date = due_date.isoformat()
+        
         try:
             cursor.execute(
-                """INSERT INTO reminders 
-                   (user_id, job_id, title, description, due_date) 
-                   VALUES (?, ?, ?, ?, ?)""",
-                (user_id, job_id, title, description, due_date)
+                f"""INSERT INTO reminders 
+                    (id, user_id, job_id, title, description, due_date, due_at) 
+                    VALUES ({self._new_id('reminders')}, ?, ?, ?, ?, ?, ?)""",
+                (self._slot(user_id), user_id, job_id, title, description, due_date, due_at)
             )
             reminder_id = cursor.lastrowid
-            conn.commit()
-            return reminder_id
+            with metrics.span("db_commit_ms", method="add_reminder"):
+                conn.commit()
         except Exception as e:
             conn.rollback()
             print(f"Error adding reminder: {e}")
             return None
         finally:
             conn.close()
+        
+        self._notify("reminder_added", {
+            "id": reminder_id, "user_id": user_id, "job_id": job_id, "title": title,
+            "description": description, "due_date": due_date, "due_at": due_at,
+        })
+        return reminder_id
+    
+    def get_pending_reminders(self, after=(-1, 0), until=None, limit=500):
+        """
+        Get undelivered, uncompleted reminders ordered by (due_at, id).
+        `after` is a (due_at, id) keyset cursor; `until` bounds due_at from above.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """SELECT * FROM reminders
+                   WHERE notified_at IS NULL AND completed = 0
+                     AND (due_at, id) > (?, ?) AND due_at <= ?
+                   ORDER BY due_at, id LIMIT ?""",
+                (after[0], after[1], until if until is not None else 2**62, limit)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    
+    def mark_reminder_notified(self, reminder_id, notified_at=None):
+        """Record that a reminder has been delivered."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                "UPDATE reminders SET notified_at = ? WHERE id = ?",
+                (int(notified_at if notified_at is not None else datetime.now().timestamp()), reminder_id)
+            )
+            with metrics.span("db_commit_ms", method="mark_reminder_notified"):
+                conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Error marking reminder notified: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def complete_reminder(self, reminder_id):
+        """Mark a reminder as completed so it is no longer delivered."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("UPDATE reminders SET completed = 1 WHERE id = ?", (reminder_id,))
+            with metrics.span("db_commit_ms", method="complete_reminder"):
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error completing reminder: {e}")
+            return False
+        finally:
+            conn.close()
+        
+        self._notify("reminder_completed", {"id": reminder_id})
+        return True
     
-    def log_search(self, user_id, query, location=None, results_count=0):
-        """Log a search query to the database."""
-        conn = sqlite3.connect(self.db_path)
+    def log_search(self, user_id, query, location=None, results_count=0, site=None, duration_ms=None, cache_hit=False,
+                   coalesced=False):
+        """
+        Log a search query to the database. `coalesced` marks a search that
+        waited for an identical crawl already in progress.
+        """
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
             cursor.execute(
-                """INSERT INTO search_history 
-                   (user_id, query, location, results_count) 
-                   VALUES (?, ?, ?, ?)""",
-                (user_id, query, location, results_count)
+                f"""INSERT INTO search_history 
+                    (id, user_id, query, location, results_count, site, duration_ms, cache_hit, coalesced) 
+                    VALUES ({self._new_id('search_history')}, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (self._slot(user_id), user_id, query, location, results_count, site, duration_ms, cache_hit, coalesced)
             )
-            conn.commit()
+            self._touch(cursor, user_id)
+            with metrics.span("db_commit_ms", method="log_search"):
+                conn.commit()
             return True
         except Exception as e:
             conn.rollback()
@@ -252,9 +1433,76 @@ class Database:
         finally:
             conn.close()
     
+    def get_search_stats(self, since=None):
+        """
+        Per-site search statistics for tuning cache TTLs: searches, hit rate and
+        average duration of crawls versus cache hits. Coalesced searches (which
+        neither crawled nor hit the cache) are counted on their own and left
+        out of the hit rate and both averages.
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """SELECT site, 
+                          COUNT(*) AS searches, 
+                          SUM(cache_hit) AS cache_hits, 
+                          SUM(coalesced) AS coalesced, 
+                          ROUND(AVG(CASE WHEN coalesced THEN NULL ELSE cache_hit END), 4) AS hit_rate, 
+                          AVG(CASE WHEN cache_hit OR coalesced THEN NULL ELSE duration_ms END) AS avg_crawl_ms, 
+                          AVG(CASE WHEN cache_hit THEN duration_ms END) AS avg_hit_ms 
+                   FROM search_history 
+                   WHERE site IS NOT NULL AND timestamp >= COALESCE(?, '') 
+                   GROUP BY site""",
+                (since,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    
+    def get_cached_search(self, site, query_key, location_key, max_age):
+        """Return the cached results JSON for a search if younger than max_age seconds."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """SELECT results FROM search_cache 
+                   WHERE site = ? AND query_key = ? AND location_key = ? AND created_at >= ?""",
+                (site, query_key, location_key, int(datetime.now().timestamp()) - max_age)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+    
+    def store_cached_search(self, site, query_key, location_key, results, results_count):
+        """Store (or replace) the cached results JSON for a search."""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """INSERT OR REPLACE INTO search_cache 
+                   (site, query_key, location_key, results, results_count, created_at) 
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (site, query_key, location_key, results, results_count, int(datetime.now().timestamp()))
+            )
+            with metrics.span("db_commit_ms", method="store_cached_search"):
+                conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Error storing cached search: {e}")
+            return False
+        finally:
+            conn.close()
+    
     def update_profile(self, user_id, **profile_data):
         """Update or create user profile."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -269,12 +1517,13 @@ class Database:
                 cursor.execute(query, list(profile_data.values()) + [user_id])
             else:
                 # Create new profile
-                keys = list(profile_data.keys()) + ["user_id"]
-                placeholders = ["?"] * len(keys)
+                keys = list(profile_data.keys()) + ["user_id", "id"]
+                placeholders = ["?"] * (len(keys) - 1) + [self._new_id("user_profiles")]
                 query = f"INSERT INTO user_profiles ({', '.join(keys)}) VALUES ({', '.join(placeholders)})"
-                cursor.execute(query, list(profile_data.values()) + [user_id])
+                cursor.execute(query, list(profile_data.values()) + [user_id, self._slot(user_id)])
             
-            conn.commit()
+            with metrics.span("db_commit_ms", method="update_profile"):
+                conn.commit()
             return True
         except Exception as e:
             conn.rollback()
@@ -285,7 +1534,7 @@ class Database:
             
     def get_profile(self, user_id):
         """Get user profile data."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -298,7 +1547,7 @@ class Database:
             
     def get_user_by_username(self, username):
         """Get user by username."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -309,5 +1558,34 @@ class Database:
         finally:
             conn.close()
     
-# Create a global database instance
-db = Database() 
\ No newline at end of file
+    def get_user_by_email(self, email):
+        """Get user by email."""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
+            user = cursor.fetchone()
+            return dict(user) if user else None
+        finally:
+            conn.close()
+    
+_default_db = None
+_default_db_lock = threading.Lock()
+
+def get_default_db():
+    """The process-wide Database for DB_PATH, created on first use."""
+    global _default_db
+    with _default_db_lock:
+        if _default_db is None:
+            _default_db = Database()
+        return _default_db
+
+def __getattr__(name):
+    # The global instance (`from src.database import db`) is built lazily: with
+    # DB_SHARDS > 1 building it imports src.sharding, which imports this module,
+    # so it cannot be created while this module is still initializing.
+    if name == "db":
+        return get_default_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,118 @@
+import re
+import random
+import struct
+import hashlib
+from array import array
+
+from src.config import MINHASH_PERMUTATIONS, LSH_BANDS
+
+# Mersenne prime used for the universal hash family
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 61) - 1
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+# Title words that vary between sources without changing the role
+_TITLE_NOISE = {
+    "sr": "senior", "jr": "junior", "snr": "senior", "mgr": "manager", "eng": "engineer",
+    "dev": "developer", "ii": "2", "iii": "3",
+}
+_TITLE_STOPWORDS = {"the", "a", "an", "and", "of", "for", "to", "in", "at", "remote", "hybrid", "onsite"}
+_LOCATION_STOPWORDS = {"remote", "hybrid", "onsite", "on", "site", "area", "metro", "greater", "usa", "us", "united", "states"}
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "gmbh", "plc", "limited"}
+
+
+def _hash64(text):
+    return struct.unpack("<Q", hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest())[0]
+
+
+def normalize_title(title):
+    tokens = [_TITLE_NOISE.get(token, token) for token in _TOKEN.findall((title or "").lower())]
+    return [token for token in tokens if token not in _TITLE_STOPWORDS]
+
+
+def normalize_company(company):
+    tokens = _TOKEN.findall((company or "").lower())
+    return " ".join(token for token in tokens if token not in _COMPANY_SUFFIXES)
+
+
+def normalize_location(location):
+    return [token for token in _TOKEN.findall((location or "").lower()) if token not in _LOCATION_STOPWORDS]
+
+
+def shingles(title, company, description=None, size=3, location=None):
+    """
+    Feature set for a posting: word `size`-grams of the description plus
+    title words/bigrams, the normalized company name and location words.
+    Location features keep one role posted in several cities apart even
+    when the descriptions are boilerplate.
+    """
+    features = set()
+    company_key = normalize_company(company)
+    if company_key:
+        features.add("c:" + company_key)
+    features.update("l:" + token for token in normalize_location(location))
+
+    title_tokens = normalize_title(title)
+    features.update("t:" + token for token in title_tokens)
+    features.update("t:" + " ".join(pair) for pair in zip(title_tokens, title_tokens[1:]))
+
+    words = _TOKEN.findall((description or "").lower())
+    if len(words) >= size:
+        features.update(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    elif words:
+        features.add(" ".join(words))
+    return features
+
+
+class MinHasher:
+    """MinHash signatures from a fixed family of universal hash functions."""
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, features):
+        """Compute the MinHash signature of a feature set."""
+        hashes = [_hash64(feature) for feature in features]
+        if not hashes:
+            return array("Q", [_MAX_HASH] * self.num_perm)
+        return array("Q", [
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in self._params
+        ])
+
+
+def similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of the feature sets behind two signatures."""
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+
+def lsh_buckets(signature, bands=LSH_BANDS):
+    """
+    Band the signature and hash each band to a bucket key.
+    The band number is mixed into the key, so one indexed column holds all bands.
+    """
+    rows = len(signature) // bands
+    buckets = []
+    for band in range(bands):
+        chunk = signature[band * rows:(band + 1) * rows]
+        digest = hashlib.blake2b(struct.pack(f"<I{rows}Q", band, *chunk), digest_size=8).digest()
+        # Keep the key within SQLite's signed 64-bit INTEGER range
+        buckets.append(struct.unpack("<q", digest)[0])
+    return buckets
+
+
+def pack_signature(signature):
+    return signature.tobytes()
+
+
+def unpack_signature(blob):
+    signature = array("Q")
+    signature.frombytes(blob)
+    return signature
+
+
+# Shared hasher: signatures are only comparable when produced by the same parameters
+default_hasher = MinHasher()
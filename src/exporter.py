@@ -0,0 +1,185 @@
+import os
+import csv
+import gzip
+import json
+import base64
+import argparse
+
+# Columns written for every exported job, in order. "description" is replaced
+# by "description_zlib" when descriptions are compressed, or dropped.
+EXPORT_COLUMNS = [
+    ("id", "int64"),
+    ("user_id", "int64"),
+    ("title", "string"),
+    ("company", "string"),
+    ("location", "string"),
+    ("url", "string"),
+    ("source", "string"),
+    ("status", "string"),
+    ("applied_date", "string"),
+    ("response_date", "string"),
+    ("match_score", "float64"),
+    ("created_at", "string"),
+    ("status_changed_at", "int64"),
+    ("canonical_job_id", "int64"),
+    ("notes", "string"),
+    ("description", "string"),
+    ("skills", "list<string>"),
+    ("required_skills", "list<string>"),
+]
+
+FORMATS = ("parquet", "arrow", "csv")
+DESCRIPTION_MODES = ("include", "exclude", "compress")
+
+# Separator between skills in CSV cells
+CSV_LIST_SEPARATOR = "; "
+
+
+def export_columns(description="include"):
+    """(name, type) pairs for an export with the given description mode."""
+    if description not in DESCRIPTION_MODES:
+        raise ValueError(f"description must be one of {DESCRIPTION_MODES}, got {description!r}")
+    columns = []
+    for name, kind in EXPORT_COLUMNS:
+        if name == "description":
+            if description == "exclude":
+                continue
+            if description == "compress":
+                name, kind = "description_zlib", "binary"
+        columns.append((name, kind))
+    return columns
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "binary": pa.binary(),
+        "list<string>": pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+class CsvChunkWriter:
+    """Writes chunks of rows to CSV (gzipped when the path ends in .gz)."""
+    def __init__(self, path, columns):
+        self.columns = columns
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "wt", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in columns])
+        self._kinds = [kind for _, kind in columns]
+
+    def write(self, rows):
+        for row in rows:
+            self._writer.writerow([self._cell(value, kind) for value, kind in zip(row, self._kinds)])
+
+    @staticmethod
+    def _cell(value, kind):
+        if value is None:
+            return ""
+        if kind == "list<string>":
+            return CSV_LIST_SEPARATOR.join(value)
+        if kind == "binary":
+            return base64.b64encode(value).decode("ascii")
+        return value
+
+    def close(self):
+        self._file.close()
+
+
+class ArrowChunkWriter:
+    """
+    Writes chunks of rows as record batches to a Parquet file (one row group
+    per chunk) or an Arrow IPC file. Only one chunk is held in memory.
+    """
+    def __init__(self, path, columns, fmt="parquet", compression="zstd"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(f"{fmt} export requires pyarrow (pip install pyarrow); use fmt='csv' without it") from None
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        self.columns = columns
+        self.schema = _arrow_schema(columns)
+        if fmt == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression)
+        else:
+            options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pyarrow.ipc.new_file(path, self.schema, options=options)
+        self._fmt = fmt
+
+    def write(self, rows):
+        import pyarrow as pa
+
+        arrays = [
+            pa.array([row[index] for row in rows], type=field.type)
+            for index, field in enumerate(self.schema)
+        ]
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self._fmt == "parquet":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path, fmt, columns):
+    """Open a chunk writer for one of FORMATS."""
+    if fmt == "csv":
+        return CsvChunkWriter(path, columns)
+    if fmt in ("parquet", "arrow"):
+        return ArrowChunkWriter(path, columns, fmt)
+    raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+
+
+def format_for_path(path):
+    """Guess the export format from a file name."""
+    name = os.path.basename(path).lower()
+    if name.endswith((".csv", ".csv.gz")):
+        return "csv"
+    if name.endswith((".arrow", ".feather", ".ipc")):
+        return "arrow"
+    return "parquet"
+
+
+def main(argv=None):
+    """Command-line export: python -m src.exporter jobs.parquet --user-id 1 --description exclude"""
+    parser = argparse.ArgumentParser(description="Export jobs with their skills to Parquet, Arrow or CSV.")
+    parser.add_argument("path", help="Output file; the format follows the extension unless --format is given")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--db", help="SQLite file to export from (default: DB_PATH)")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--status", nargs="+")
+    parser.add_argument("--source")
+    parser.add_argument("--since", help="Earliest created_at, e.g. 2025-01-01")
+    parser.add_argument("--until", help="created_at upper bound (exclusive)")
+    parser.add_argument("--min-match-score", type=float)
+    parser.add_argument("--no-duplicates", action="store_true", help="Skip jobs linked to a canonical posting")
+    parser.add_argument("--description", choices=DESCRIPTION_MODES, default="include")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    from src.config import DB_PATH
+    from src.database import Database
+
+    database = Database(args.db or DB_PATH)
+    stats = database.export_jobs(
+        args.path, fmt=args.format, description=args.description, chunk_size=args.chunk_size,
+        user_id=args.user_id, status=args.status, source=args.source, since=args.since, until=args.until,
+        min_match_score=args.min_match_score, include_duplicates=not args.no_duplicates,
+    )
+    if stats is None:
+        return 1
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+import logging
+import threading
+
+from src.config import FOLLOW_UP_AFTER_DAYS
+from src.database import get_default_db
+from src.metrics import metrics
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CURSOR_KEY = "follow_up_engine.last_event_id"
+
+
+class FollowUpRule:
+    """
+    Turns a status transition into a reminder due `after_days` later.
+    The reminder is cancelled automatically if the job's status changes
+    again before it is delivered (e.g. applied -> interview cancels the
+    "no response" follow-up).
+    """
+    def __init__(self, name, to_status, after_days, title, description=None, from_status=None):
+        self.name = name
+        self.to_status = to_status
+        self.from_status = from_status
+        self.after_days = after_days
+        self.title = title
+        self.description = description
+
+    def matches(self, event):
+        """Check whether a status event triggers this rule."""
+        if event["to_status"] != self.to_status:
+            return False
+        return self.from_status is None or event["from_status"] == self.from_status
+
+    def build_reminder(self, event, job):
+        """Build a reminder tuple for Database.apply_follow_ups."""
+        fields = {"title": job.get("title") or "this job", "company": job.get("company") or "the company"}
+        return (
+            event["user_id"],
+            event["job_id"],
+            self.title.format(**fields),
+            self.description.format(**fields) if self.description else None,
+            int(event["changed_at"] + self.after_days * 86400),
+            self.name,
+            event["id"],
+        )
+
+
+DEFAULT_RULES = [
+    FollowUpRule(
+        "applied_no_response", to_status="applied", after_days=FOLLOW_UP_AFTER_DAYS,
+        title="Follow up on {title} at {company}",
+        description=f"No response {FOLLOW_UP_AFTER_DAYS} days after applying. Consider a short follow-up email.",
+    ),
+    FollowUpRule(
+        "interview_thank_you", to_status="interview", after_days=1,
+        title="Send a thank-you note to {company}",
+        description="Thank the interviewers for the {title} interview.",
+    ),
+    FollowUpRule(
+        "offer_decision", to_status="offer", after_days=3,
+        title="Respond to the {company} offer",
+        description="Review and respond to the offer for {title}.",
+    ),
+]
+
+
+class FollowUpEngine:
+    """
+    Applies follow-up rules to the job_status_events log.
+
+    Events are consumed in id order from a persisted cursor, so each event is
+    handled once. Each batch of events becomes one transaction: pending
+    follow-ups for jobs that changed status are cancelled, new reminders are
+    inserted, and the cursor moves forward. When started, the engine wakes on
+    "job_status_changed" notifications and drains whatever has accumulated.
+    """
+    def __init__(self, database=None, rules=None, batch_size=500):
+        self.db = database or get_default_db()
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.batch_size = batch_size
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _on_change(self, event, payload):
+        if event == "job_status_changed":
+            self._wakeup.set()
+
+    def _process_batch(self, database, events):
+        # Only the latest event per job can still trigger a follow-up
+        latest = {}
+        for event in events:
+            latest[event["job_id"]] = event
+
+        jobs = database.get_jobs_by_ids(list(latest))
+        reminders = []
+        for job_id, event in latest.items():
+            job = jobs.get(job_id)
+            if job is None or job.get("status") != event["to_status"]:
+                continue
+            for rule in self.rules:
+                if rule.matches(event):
+                    reminders.append(rule.build_reminder(event, job))
+
+        # Every job with a new event has moved past its earlier follow-ups
+        return database.apply_follow_ups(reminders, list(latest), CURSOR_KEY, events[-1]["id"])
+
+    def _run_database(self, database):
+        created = 0
+        last_event_id = database.get_meta(CURSOR_KEY, 0)
+        while True:
+            events = database.get_status_events(after_id=last_event_id, limit=self.batch_size)
+            if not events:
+                break
+            added = self._process_batch(database, events)
+            if added is None:
+                # Leave the cursor where it is and retry on the next run
+                break
+            created += added
+            last_event_id = events[-1]["id"]
+            if len(events) < self.batch_size:
+                break
+        return created
+
+    def run(self):
+        """Process all unhandled status events. Returns the number of reminders created."""
+        created = 0
+        with self._lock:
+            # A sharded store keeps an event log and cursor in each shard
+            for database in getattr(self.db, "shards", [self.db]):
+                created += self._run_database(database)
+        metrics.inc("follow_up_reminders_created_total", created)
+        return created
+
+    def _run(self):
+        """Engine thread: drain events whenever a status change is signalled."""
+        while not self._stop_event.is_set():
+            self._wakeup.wait(timeout=60.0)
+            self._wakeup.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                created = self.run()
+                if created:
+                    logger.info(f"Created {created} follow-up reminders")
+            except Exception as e:
+                logger.error(f"Error processing follow-up rules: {e}")
+
+    def start(self):
+        """Start processing status events in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self.db.add_listener(self._on_change)
+        self._wakeup.set()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self.db.remove_listener(self._on_change)
+        if self._thread is not None:
+            self._stop_event.set()
+            self._wakeup.set()
+            self._thread.join(timeout=5.0)
+            self._thread = None
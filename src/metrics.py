@@ -0,0 +1,266 @@
+import json
+import time
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config import METRICS_ENABLED, METRICS_PORT
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds
+DEFAULT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+METRIC_PREFIX = "jobtracker_"
+
+
+class Counter:
+    """A monotonically increasing value."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    """Bucketed distribution of observed values (usually milliseconds)."""
+    __slots__ = ("buckets", "counts", "sum", "count", "min", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "avg": round(self.sum / self.count, 3) if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class _NullSpan:
+    """Span returned when metrics are disabled; does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times a block of code and records it into a histogram."""
+    __slots__ = ("_metrics", "_name", "_labels", "_start")
+
+    def __init__(self, metrics, name, labels):
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self._start) * 1000.0
+        self._metrics.observe(self._name, elapsed_ms, **self._labels)
+        if exc_type is not None:
+            self._metrics.inc(f"{self._name}_errors_total", **self._labels)
+        return False
+
+
+class Metrics:
+    """
+    Registry of counters and histograms for hot-path instrumentation.
+    When disabled every call returns immediately, so instrumented code pays
+    only an attribute lookup and a branch.
+    """
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._server = None
+
+    @staticmethod
+    def _key(name, labels):
+        return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+    def enable(self):
+        """Turn metric collection on."""
+        self.enabled = True
+
+    def disable(self):
+        """Turn metric collection off (recorded values are kept)."""
+        self.enabled = False
+
+    def reset(self):
+        """Drop all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def inc(self, name, amount=1, **labels):
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = Counter()
+            counter.inc(amount)
+
+    def observe(self, name, value, **labels):
+        """Record a value into a histogram."""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def span(self, name, **labels):
+        """Context manager that records the elapsed milliseconds of a block."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, labels)
+
+    def get_counter(self, name, **labels):
+        """Return the current value of a counter (0 if never incremented)."""
+        counter = self._counters.get(self._key(name, labels))
+        return counter.value if counter else 0
+
+    def get_histogram(self, name, **labels):
+        """Return a histogram summary dict, or None if nothing was observed."""
+        histogram = self._histograms.get(self._key(name, labels))
+        return histogram.to_dict() if histogram else None
+
+    def snapshot(self):
+        """Return all metrics as a JSON-serialisable dict."""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": counter.value}
+                for (name, labels), counter in sorted(self._counters.items())
+            ]
+            histograms = [
+                dict({"name": name, "labels": dict(labels)}, **histogram.to_dict())
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    def to_json(self, indent=None):
+        """Return a JSON snapshot of all metrics."""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    @staticmethod
+    def _format_labels(labels, extra=None):
+        items = list(labels) + (list(extra) if extra else [])
+        if not items:
+            return ""
+        escaped = [
+            (key, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+            for key, value in items
+        ]
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            seen = set()
+            for (name, labels), counter in sorted(self._counters.items()):
+                metric = METRIC_PREFIX + name
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{self._format_labels(labels)} {counter.value}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = METRIC_PREFIX + name
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    le = self._format_labels(labels, [("le", bound)])
+                    lines.append(f"{metric}_bucket{le} {cumulative}")
+                lines.append(f"{metric}_sum{self._format_labels(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{self._format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=METRICS_PORT, host="127.0.0.1"):
+        """
+        Start a background HTTP server exposing /metrics (Prometheus text)
+        and /metrics.json (JSON snapshot). Used by the processes that have no
+        HTTP API of their own (the dashboard, the reminder service).
+        """
+        if self._server is not None:
+            return self._server
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = registry.to_json().encode("utf-8")
+                    content_type = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = registry.to_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Metrics server listening on http://{host}:{self._server.server_port}/metrics")
+        return self._server
+
+    def stop_server(self):
+        """Stop the metrics HTTP server if it is running."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Create a global metrics registry
+metrics = Metrics()
@@ -0,0 +1,144 @@
+import sys
+from dataclasses import dataclass, field, fields
+
+# Low-cardinality string fields shared by many records; interned so that
+# hundreds of thousands of in-flight jobs reference one copy of each value
+_INTERNED_JOB_FIELDS = ("source", "status", "location")
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class _RecordMixin:
+    """
+    Dict-style access for slotted records, so code written against the old
+    per-job dicts (job["url"], job.get("source"), dict(job), `for key in job`)
+    keeps working. Keys that are not fields are kept in a lazily created
+    `extra` dict.
+
+    Every field is a key, None included, like the dict(row) of a jobs row:
+    `"notes" in job` is True and job.get("notes", "") returns None when the
+    column is NULL. keys(), iteration, len() and to_dict() agree on that.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def field_names(cls):
+        return cls._FIELD_NAMES
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from a sqlite3.Row or a mapping."""
+        data = dict(row)
+        known = {key: data.pop(key) for key in cls._FIELD_NAMES if key in data}
+        record = cls(**known)
+        if data:
+            record.extra = data
+        return record
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._FIELD_SET or (self.extra is not None and key in self.extra)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def keys(self):
+        names = list(self._FIELD_NAMES)
+        if self.extra:
+            names.extend(self.extra)
+        return names
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, other=(), **kwargs):
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+    def to_dict(self):
+        """Return a plain dict of every field plus extra keys, e.g. for JSON."""
+        data = {name: getattr(self, name) for name in self._FIELD_NAMES}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True, eq=False)
+class Job(_RecordMixin):
+    """A job posting, as scraped by BrowserController or stored in the jobs table."""
+    title: str = None
+    company: str = None
+    location: str = None
+    url: str = None
+    source: str = None
+    description: str = None
+    id: int = None
+    user_id: int = None
+    status: str = None
+    applied_date: str = None
+    response_date: str = None
+    match_score: float = None
+    created_at: str = None
+    notes: str = None
+    status_changed_at: int = None
+    canonical_job_id: int = None
+    extra: dict = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.source = _intern(self.source)
+        self.status = _intern(self.status)
+        self.location = _intern(self.location)
+
+    def __setitem__(self, key, value):
+        if key in _INTERNED_JOB_FIELDS:
+            value = _intern(value)
+        _RecordMixin.__setitem__(self, key, value)
+
+
+@dataclass(slots=True, eq=False)
+class JobSkill(_RecordMixin):
+    """A skill attached to a job, as stored in the job_skills table."""
+    skill: str = None
+    required: bool = False
+    job_id: int = None
+    relevance: int = None
+    id: int = None
+    extra: dict = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.skill = _intern(self.skill)
+        self.required = bool(self.required)
+
+
+for _record_type in (Job, JobSkill):
+    _record_type._FIELD_NAMES = tuple(f.name for f in fields(_record_type) if f.name != "extra")
+    _record_type._FIELD_SET = frozenset(_record_type._FIELD_NAMES)
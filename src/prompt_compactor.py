@@ -0,0 +1,136 @@
+import re
+import math
+
+# Headings of sections worth sending to the model
+KEEP_HEADING = re.compile(
+    r"\b(requirements?|required|responsibilit(y|ies)|qualifications?|skills|duties|"
+    r"what you('ll| will) (do|bring|need)|about the (role|job|position)|the role|your role|"
+    r"who you are|what we('re| are) looking for|must[- ]haves?|nice[- ]to[- ]haves?|"
+    r"preferred|bonus points|experience|tech(nology)? stack|you have|you will)\b",
+    re.IGNORECASE,
+)
+
+# Headings of sections that never help skill extraction or matching
+DROP_HEADING = re.compile(
+    r"\b(similar jobs|people also (viewed|searched)|more jobs|recommended jobs|jobs you may like|"
+    r"about (the company|us)|company overview|benefits|perks|equal opportunity|eeo|"
+    r"privacy|cookies?|terms of (service|use)|share this job|report this job|"
+    r"salary insights|reviews?|interview questions)\b",
+    re.IGNORECASE,
+)
+
+# Navigation, buttons and footer lines left over from soup.body text
+BOILERPLATE_LINE = re.compile(
+    r"^(home|jobs|companies|salaries|sign in|sign up|log in|join now|apply|apply now|easy apply|"
+    r"save|saved|share|report|show more|show less|see more|see less|next|previous|back|menu|"
+    r"skip to (main )?content|\d+ (days?|hours?|weeks?) ago|.*all rights reserved.*|"
+    r"(©|\(c\)|copyright).*)$",
+    re.IGNORECASE,
+)
+
+WHITESPACE = re.compile(r"\s+")
+
+# Rough characters-per-token ratio for English prose
+CHARS_PER_TOKEN = 4
+
+# Shortest useful fragment when a line has to be cut to fit the budget
+MIN_PARTIAL_LINE_CHARS = 40
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used for budgeting."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _is_heading(line):
+    if line.endswith(":"):
+        return len(line) <= 80
+    if len(line) > 60 or line.endswith((".", "!", "?", ",", ";")):
+        return False
+    return len(line.split()) <= 6 and bool(KEEP_HEADING.search(line) or DROP_HEADING.search(line))
+
+
+def _segment(lines):
+    """Split lines into (heading, body_lines) sections; the preamble has heading None."""
+    sections = [[None, []]]
+    for line in lines:
+        if _is_heading(line):
+            sections.append([line, []])
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[0] or section[1]]
+
+
+def _unique_lines(text):
+    """Strip and dedupe lines, dropping navigation/footer boilerplate."""
+    seen = set()
+    lines = []
+    for raw in text.splitlines():
+        line = WHITESPACE.sub(" ", raw).strip()
+        if not line or BOILERPLATE_LINE.match(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def compact_description(text, token_budget):
+    """
+    Trim a job description to the parts useful to the model.
+
+    Lines are deduplicated and stripped of navigation/footer boilerplate, the
+    text is split into sections by heading, and sections are kept by relevance:
+    requirement/responsibility/qualification sections first, then unclassified
+    text, never "similar jobs", benefits, legal or company blurbs (unless
+    nothing else is left). Whole lines are kept until `token_budget` is reached.
+
+    Returns (compacted_text, stats) where stats has original_tokens and
+    compacted_tokens.
+    """
+    original_tokens = estimate_tokens(text)
+    if not text:
+        return text, {"original_tokens": 0, "compacted_tokens": 0}
+
+    sections = _segment(_unique_lines(text))
+    ranked = []
+    for index, (heading, body) in enumerate(sections):
+        if heading and DROP_HEADING.search(heading) and not KEEP_HEADING.search(heading):
+            priority = 0
+        elif heading and KEEP_HEADING.search(heading):
+            priority = 2
+        else:
+            priority = 1
+        ranked.append((priority, index, heading, body))
+
+    if not any(priority > 0 for priority, *_ in ranked):
+        ranked = [(1, index, heading, body) for _, index, heading, body in ranked]
+
+    # Fill the budget by priority, then restore document order
+    kept = {}
+    remaining = token_budget
+    for priority, index, heading, body in sorted(ranked, key=lambda item: (-item[0], item[1])):
+        if priority == 0 or remaining <= 0:
+            continue
+        lines = []
+        spent = 0
+        for line in ([heading] if heading else []) + body:
+            cost = estimate_tokens(line) + 1
+            if cost > remaining - spent:
+                # Cut an oversized line at a word boundary rather than losing it entirely
+                chars = (remaining - spent - 1) * CHARS_PER_TOKEN
+                if chars >= MIN_PARTIAL_LINE_CHARS:
+                    partial = line[:chars].rsplit(" ", 1)[0]
+                    lines.append(partial)
+                    spent += estimate_tokens(partial) + 1
+                break
+            lines.append(line)
+            spent += cost
+        if lines and lines != [heading]:
+            kept[index] = lines
+            remaining -= spent
+
+    compacted = "\n".join(line for index in sorted(kept) for line in kept[index])
+    return compacted, {"original_tokens": original_tokens, "compacted_tokens": estimate_tokens(compacted)}
@@ -0,0 +1,252 @@
+import json
+import time
+import heapq
+import logging
+import argparse
+import threading
+from datetime import datetime
+
+from src.config import METRICS_ENABLED
+from src.database import get_default_db
+from src.metrics import metrics
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class LogSink:
+    """Delivers reminders by writing them to the log."""
+    def deliver(self, reminder):
+        logger.info(f"Reminder due for user {reminder['user_id']}: {reminder['title']}")
+
+
+class FileSink:
+    """Delivers reminders by appending them as JSON lines to a file."""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def deliver(self, reminder):
+        line = json.dumps(dict(reminder, delivered_at=datetime.now().isoformat(timespec="seconds")))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class ReminderScheduler:
+    """
+    Fires reminders when they fall due.
+
+    Pending reminders are held in a min-heap keyed on their normalized due
+    time. Only a window of upcoming reminders (`horizon` seconds ahead, at most
+    `batch_size` rows per load) is read from the indexed reminders table, using
+    a (due_at, id) keyset cursor so the table is never rescanned. Reminders
+    added while the scheduler is running arrive through database change
+    notifications. The worker thread sleeps until the next due time.
+
+    Change notifications only come from the Database instance the scheduler
+    was given, in this process. Reminders written any other way (the API or
+    dashboard process, another Database instance) may be due before the
+    cursor, so every `poll_interval` seconds the reminders due within the
+    next interval are re-read and the unscheduled ones added; such a
+    reminder fires at most `poll_interval` seconds late.
+    """
+    def __init__(self, database=None, sinks=None, horizon=3600, batch_size=500, retry_delay=60, poll_interval=60,
+                 clock=time.time):
+        self.db = database or get_default_db()
+        self.sinks = sinks if sinks is not None else [LogSink()]
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.clock = clock
+
+        self._heap = []
+        self._scheduled = set()
+        self._cancelled = set()
+        self._cursor = (-1, 0)
+        self._window_end = None
+        self._loaded_until = None
+        self._next_poll = None
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.db.add_listener(self._on_change)
+
+    def _on_change(self, event, payload):
+        """Database listener: schedule new reminders, drop completed ones."""
+        with self._condition:
+            if event == "reminder_added":
+                due_at = payload.get("due_at")
+                # Reminders beyond the loaded window are picked up by the cursor later
+                if due_at is not None and self._loaded_until is not None and due_at <= self._loaded_until:
+                    self._push(payload)
+                    self._condition.notify()
+            elif event == "reminder_completed":
+                if payload["id"] in self._scheduled:
+                    self._cancelled.add(payload["id"])
+
+    def _push(self, reminder):
+        if reminder["id"] in self._scheduled:
+            return
+        self._scheduled.add(reminder["id"])
+        heapq.heappush(self._heap, (reminder["due_at"], reminder["id"], reminder))
+
+    def _load(self, now):
+        """Load the next page of pending reminders into the heap."""
+        if self._window_end is None or self._window_end < now + self.horizon:
+            self._window_end = int(now + self.horizon)
+
+        rows = self.db.get_pending_reminders(after=self._cursor, until=self._window_end, limit=self.batch_size)
+        for row in rows:
+            self._push(row)
+        if rows:
+            self._cursor = (rows[-1]["due_at"], rows[-1]["id"])
+
+        # With a full page there may be more rows in the window, but all of them
+        # are due no earlier than the cursor
+        self._loaded_until = self._cursor[0] if len(rows) == self.batch_size else self._window_end
+        metrics.inc("reminders_loaded_total", len(rows))
+
+    def _poll(self, now):
+        """Add reminders due within the next poll interval that the cursor has already passed."""
+        until = min(int(now + self.poll_interval), self._cursor[0])
+        after = (-1, 0)
+        found = 0
+        while True:
+            rows = self.db.get_pending_reminders(after=after, until=until, limit=self.batch_size)
+            for row in rows:
+                if row["id"] not in self._scheduled:
+                    self._push(row)
+                    found += 1
+            if len(rows) < self.batch_size:
+                break
+            after = (rows[-1]["due_at"], rows[-1]["id"])
+        self._next_poll = now + self.poll_interval
+        metrics.inc("reminders_loaded_total", found)
+
+    def _pop_due(self, now):
+        """Remove and return all reminders due at or before `now`."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, reminder_id, reminder = heapq.heappop(self._heap)
+            self._scheduled.discard(reminder_id)
+            if reminder_id in self._cancelled:
+                self._cancelled.discard(reminder_id)
+                continue
+            due.append(reminder)
+        return due
+
+    def _deliver(self, reminder):
+        delivered = False
+        for sink in self.sinks:
+            try:
+                sink.deliver(reminder)
+                delivered = True
+            except Exception as e:
+                logger.error(f"Error delivering reminder {reminder['id']} via {type(sink).__name__}: {e}")
+
+        if delivered:
+            self.db.mark_reminder_notified(reminder["id"], self.clock())
+            metrics.inc("reminders_delivered_total")
+        else:
+            # Try again later
+            with self._condition:
+                self._push(dict(reminder, due_at=int(self.clock() + self.retry_delay)))
+            metrics.inc("reminders_failed_total")
+        return delivered
+
+    def run_pending(self):
+        """Deliver every reminder that is currently due. Returns the number delivered."""
+        delivered = 0
+        while True:
+            now = self.clock()
+            with self._condition:
+                if self._loaded_until is None or now >= self._loaded_until:
+                    self._load(now)
+                if self._next_poll is None or now >= self._next_poll:
+                    self._poll(now)
+                due = self._pop_due(now)
+                more = self._loaded_until <= now
+            for reminder in due:
+                delivered += self._deliver(reminder)
+            if not due and not more:
+                return delivered
+
+    def _next_wakeup(self):
+        wake_at = min(self._loaded_until, self._next_poll)
+        if self._heap and self._heap[0][0] < wake_at:
+            wake_at = self._heap[0][0]
+        return wake_at
+
+    def _run(self):
+        """Scheduler thread: deliver due reminders, then sleep until the next one."""
+        while not self._stop_event.is_set():
+            try:
+                self.run_pending()
+                with self._condition:
+                    if self._stop_event.is_set():
+                        break
+                    timeout = self._next_wakeup() - self.clock()
+                    if timeout > 0:
+                        self._condition.wait(timeout)
+            except Exception as e:
+                logger.error(f"Error in reminder scheduler: {e}")
+                self._stop_event.wait(self.retry_delay)
+
+    def start(self):
+        """Start the scheduler in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        if self._on_change not in self.db._listeners:
+            self.db.add_listener(self._on_change)
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info("Reminder scheduler started")
+
+    def stop(self):
+        """Stop the scheduler thread."""
+        self.db.remove_listener(self._on_change)
+        if self._thread is not None:
+            self._stop_event.set()
+            with self._condition:
+                self._condition.notify()
+            self._thread.join(timeout=5.0)
+            self._thread = None
+            logger.info("Reminder scheduler stopped")
+
+
+def main(argv=None):
+    """Command-line service: python -m src.reminder_scheduler [--file reminders.jsonl]"""
+    parser = argparse.ArgumentParser(description="Deliver job tracker reminders as they fall due.")
+    parser.add_argument("--file", help="Also append delivered reminders as JSON lines to this file")
+    parser.add_argument("--poll-interval", type=int, default=60,
+                        help="Seconds between checks for reminders added by other processes (default: 60)")
+    args = parser.parse_args(argv)
+
+    if METRICS_ENABLED:
+        try:
+            metrics.serve()
+        except OSError as e:
+            logger.warning(f"Metrics server not started: {e}")
+    sinks = [LogSink()]
+    if args.file:
+        sinks.append(FileSink(args.file))
+    scheduler = ReminderScheduler(sinks=sinks, poll_interval=args.poll_interval)
+    scheduler.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,164 @@
+import re
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from src.config import JOB_SITES, SEARCH_CACHE_TTL, SEARCH_CACHE_MEMORY_ENTRIES
+from src.database import get_default_db
+from src.metrics import metrics
+from src.models import Job
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[^\w+#]+")
+
+
+def normalize_query(text):
+    """Normalize a query or location so trivially different searches share a cache entry."""
+    return " ".join(_NON_WORD.sub(" ", (text or "").lower()).split())
+
+
+class _Flight:
+    """A crawl in progress that other identical searches can wait on."""
+    __slots__ = ("done", "jobs", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.jobs = None
+        self.error = None
+
+
+class SearchCache:
+    """
+    Reuses BrowserController.search_jobs results for identical searches.
+
+    Results are keyed on (site, normalized query, normalized location) and kept
+    for the site's TTL, both in a small in-process LRU and in the search_cache
+    table so other processes benefit too. Identical searches running at the
+    same time in this process are coalesced: the first one crawls, the others
+    wait for its result. Every search is logged to search_history with its
+    duration and whether it was served from the cache or coalesced with a
+    crawl in progress (neither counts as the other).
+    """
+    def __init__(self, database=None, ttl=SEARCH_CACHE_TTL, memory_entries=SEARCH_CACHE_MEMORY_ENTRIES):
+        self.db = database or get_default_db()
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _ttl_for(self, site_key):
+        return JOB_SITES.get(site_key, {}).get("cache_ttl", self.ttl)
+
+    def _lookup(self, key, ttl):
+        """Return cached job dicts for a key, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, jobs = entry
+                if now - stored_at <= ttl:
+                    self._memory.move_to_end(key)
+                    return jobs
+                del self._memory[key]
+
+        cached = self.db.get_cached_search(key[0], key[1], key[2], ttl)
+        if cached is None:
+            return None
+        jobs = json.loads(cached)
+        self._remember(key, jobs, now)
+        return jobs
+
+    def _remember(self, key, jobs, stored_at):
+        with self._lock:
+            self._memory[key] = (stored_at, jobs)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _crawl(self, browser, key, site_key, query, location):
+        if hasattr(browser, "search_jobs"):
+            jobs = browser.search_jobs(site_key, query, location)
+        else:
+            with browser() as controller:
+                jobs = controller.search_jobs(site_key, query, location)
+        job_dicts = [job.to_dict() if hasattr(job, "to_dict") else dict(job) for job in jobs]
+        # An empty page usually means a timeout or a block, so it is not cached
+        if job_dicts:
+            self._remember(key, job_dicts, time.time())
+            self.db.store_cached_search(key[0], key[1], key[2], json.dumps(job_dicts), len(job_dicts))
+        return job_dicts
+
+    def search(self, browser, site_key, query, location=None, user_id=None):
+        """
+        Search a site through the cache. Returns fresh Job records, so callers
+        can fill in details without affecting other callers.
+
+        `browser` is a BrowserController, or a callable returning a context
+        manager that yields one (e.g. BrowserPool.browser); the callable is only
+        entered when this search actually crawls, so cache hits and coalesced
+        searches never check out (or start) a browser.
+        """
+        start = time.perf_counter()
+        key = (site_key, normalize_query(query), normalize_query(location))
+        ttl = self._ttl_for(site_key)
+
+        job_dicts = self._lookup(key, ttl) if ttl > 0 else None
+        cache_hit = job_dicts is not None
+        coalesced = False
+        if cache_hit:
+            metrics.inc("cache_hits_total", cache="search")
+        else:
+            with self._lock:
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+
+            if leader:
+                try:
+                    # A crawl that finished after the lookup above has filled the cache
+                    job_dicts = self._lookup(key, ttl) if ttl > 0 else None
+                    cache_hit = job_dicts is not None
+                    if cache_hit:
+                        metrics.inc("cache_hits_total", cache="search")
+                    else:
+                        metrics.inc("cache_misses_total", cache="search")
+                        job_dicts = self._crawl(browser, key, site_key, query, location)
+                    flight.jobs = job_dicts
+                except Exception as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._inflight[key]
+                    flight.done.set()
+            else:
+                metrics.inc("cache_coalesced_total", cache="search")
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                coalesced = True
+                job_dicts = flight.jobs
+
+        duration_ms = (time.perf_counter() - start) * 1000.0
+        if user_id is not None:
+            self.db.log_search(
+                user_id, query, location, len(job_dicts), site=site_key,
+                duration_ms=round(duration_ms, 2), cache_hit=cache_hit, coalesced=coalesced
+            )
+        return [Job.from_row(job) for job in job_dicts]
+
+    def invalidate(self, site_key=None):
+        """Drop in-process entries, optionally only for one site."""
+        with self._lock:
+            if site_key is None:
+                self._memory.clear()
+            else:
+                for key in [key for key in self._memory if key[0] == site_key]:
+                    del self._memory[key]
@@ -0,0 +1,584 @@
+import os
+import json
+import heapq
+import sqlite3
+import logging
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import DB_PATH, DB_POOL_SIZE, DB_SHARDS, SHARD_SLOTS
+from src.database import Database, user_hash
+from src.metrics import metrics
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Per-user tables and the column whose value modulo the slot count is the
+# row's slot. Rows of these tables move between shards with their user.
+# search_cache (shared by all users) and db_meta (per-file bookkeeping) stay put.
+SHARDED_TABLES = [
+    ("users", "id"),
+    ("user_profiles", "user_id"),
+    ("jobs", "user_id"),
+    ("job_skills", "job_id"),
+    ("reminders", "user_id"),
+    ("search_history", "user_id"),
+    ("job_status_events", "user_id"),
+    ("job_signatures", "user_id"),
+    ("job_lsh", "user_id"),
+    ("status_funnel", "user_id"),
+    ("status_transitions", "user_id"),
+    ("skill_counts", "user_id"),
+    ("source_yield", "user_id"),
+    ("data_versions", "user_id"),
+]
+
+
+def manifest_path(db_path):
+    """The manifest of a sharded store: ./data/jobtracker.db -> ./data/jobtracker.shards.json"""
+    return os.path.splitext(db_path)[0] + ".shards.json"
+
+
+def shard_path(db_path, index):
+    """File of one shard: ./data/jobtracker.db -> ./data/jobtracker.shard0.db"""
+    return f"{os.path.splitext(db_path)[0]}.shard{index}.db"
+
+
+def load_manifest(db_path):
+    """Read the manifest of a sharded store, or None if there is none."""
+    path = manifest_path(db_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(db_path, manifest):
+    """Replace the manifest atomically, so readers see the old or the new slot map."""
+    path = manifest_path(db_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def plan_slot_map(slot_map, shards):
+    """
+    Assign slots to `shards` shards as evenly as possible while moving as few
+    slots as possible: a shard keeps its slots up to its new share, and only
+    the excess (and the slots of shards that go away) is handed out.
+    """
+    slots = len(slot_map)
+    if not 1 <= shards <= slots:
+        raise ValueError(f"shards must be between 1 and {slots}, got {shards}")
+    # Larger shares go to the shards that currently hold the most slots
+    held = [0] * shards
+    for shard in slot_map:
+        if shard < shards:
+            held[shard] += 1
+    order = sorted(range(shards), key=lambda shard: -held[shard])
+    quotas = [slots // shards] * shards
+    for shard in order[:slots % shards]:
+        quotas[shard] += 1
+
+    new_map = list(slot_map)
+    counts = [0] * shards
+    spare = []
+    for slot, shard in enumerate(slot_map):
+        if shard < shards and counts[shard] < quotas[shard]:
+            counts[shard] += 1
+        else:
+            spare.append(slot)
+    shard = 0
+    for slot in spare:
+        while counts[shard] >= quotas[shard]:
+            shard += 1
+        new_map[slot] = shard
+        counts[shard] += 1
+    return new_map
+
+
+class ShardedDatabase(Database):
+    """
+    Database router over N SQLite files, each a complete Database holding the
+    users whose slot (hash of the username, modulo SHARD_SLOTS) is mapped to
+    it, together with all of their jobs, skills, reminders, searches and
+    summaries. Row ids are allocated so that id % slots is the owner's slot,
+    so a call is routed from a user id or a job/reminder id alone, and ids
+    stay unique across shards and across rebalancing.
+
+    Usernames and emails are unique across the store, as in a single file;
+    each file only enforces its own, so add_user checks every shard for the
+    email first (serialized within a process, not across processes).
+
+    Per-user calls go to one shard, so writers for users on different shards
+    never share a write lock. Cross-user reads (pending reminders, search
+    stats, the overview) run on every shard in parallel and are merged.
+
+    The slot-to-shard map is kept in <DB_PATH root>.shards.json; once it
+    exists it decides the shard count, which is changed with
+    `python -m src.sharding rebalance --shards N`.
+
+    Database(...) returns a ShardedDatabase when given more than one shard.
+    """
+    def __init__(self, db_path=DB_PATH, pool_size=DB_POOL_SIZE, shards=DB_SHARDS, id_slots=1):
+        self.db_path = db_path
+        self._listeners = []
+        self._pool = None
+
+        manifest = load_manifest(db_path)
+        if manifest is None:
+            if os.path.exists(db_path):
+                logger.warning(f"{db_path} is not moved into the sharded store; only new data is sharded")
+            slots = id_slots if id_slots > 1 else SHARD_SLOTS
+            manifest = {
+                "slots": slots,
+                "shards": [os.path.basename(shard_path(db_path, index)) for index in range(shards)],
+                "slot_map": [slot % shards for slot in range(slots)],
+            }
+            write_manifest(db_path, manifest)
+        elif len(manifest["shards"]) != shards:
+            logger.warning(
+                f"{manifest_path(db_path)} has {len(manifest['shards'])} shards, not {shards}; "
+                f"use python -m src.sharding rebalance --shards {shards} to change it"
+            )
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        self.id_slots = manifest["slots"]
+        self.slot_map = manifest["slot_map"]
+        self.shards = [
+            Database(os.path.join(directory, name), pool_size, shards=0, id_slots=self.id_slots)
+            for name in manifest["shards"]
+        ]
+        # Shards notify the router, which notifies its own listeners
+        for shard in self.shards:
+            shard.add_listener(self._notify)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="db-shard")
+        self._users_lock = threading.Lock()
+
+    def _connect(self):
+        raise RuntimeError("ShardedDatabase has no connection of its own; use shard_for() or .shards")
+
+    def close(self):
+        """Release pooled connections of every shard and stop the fan-out threads."""
+        for shard in self.shards:
+            shard.close()
+        self._executor.shutdown(wait=True)
+
+    def shard_for(self, key):
+        """Shard holding a user id, or any id of a row owned by a user."""
+        return self.shards[self.slot_map[key % self.id_slots]]
+
+    def _shard_for_username(self, username):
+        return self.shards[self.slot_map[user_hash(username) % self.id_slots]]
+
+    def _fan_out(self, method, *args, **kwargs):
+        """Call a method on every shard in parallel; results in shard order."""
+        with metrics.span("db_fan_out_ms", method=method):
+            futures = [self._executor.submit(getattr(shard, method), *args, **kwargs) for shard in self.shards]
+            return [future.result() for future in futures]
+
+    # Users
+
+    def add_user(self, username, email, password_hash):
+        """
+        Add a new user on the shard its username hashes to. Returns None if
+        the username or the email is taken, whichever shard holds it.
+        """
+        with self._users_lock:
+            if self.get_user_by_email(email) is not None:
+                return None
+            return self._shard_for_username(username).add_user(username, email, password_hash)
+
+    def get_user_by_username(self, username):
+        return self._shard_for_username(username).get_user_by_username(username)
+
+    def get_user_by_email(self, email):
+        return next((user for user in self._fan_out("get_user_by_email", email) if user), None)
+
+    def update_profile(self, user_id, **profile_data):
+        return self.shard_for(user_id).update_profile(user_id, **profile_data)
+
+    def get_profile(self, user_id):
+        return self.shard_for(user_id).get_profile(user_id)
+
+    def get_data_version(self, user_id):
+        return self.shard_for(user_id).get_data_version(user_id)
+
+    # Jobs
+
+    def add_job(self, user_id, *args, **kwargs):
+        return self.shard_for(user_id).add_job(user_id, *args, **kwargs)
+
+    def find_duplicate(self, user_id, title, company, description=None, location=None):
+        return self.shard_for(user_id).find_duplicate(user_id, title, company, description, location)
+
+    def rebuild_duplicate_index(self, user_id=None, batch_size=1000):
+        if user_id is not None:
+            return self.shard_for(user_id).rebuild_duplicate_index(user_id, batch_size)
+        return sum(self._fan_out("rebuild_duplicate_index", None, batch_size))
+
+    def set_match_score(self, job_id, match_score):
+        # Duplicates linked to a job belong to the same user, so to the same shard
+        return self.shard_for(job_id).set_match_score(job_id, match_score)
+
+    def update_job_status(self, job_id, status, applied_date=None):
+        return self.shard_for(job_id).update_job_status(job_id, status, applied_date)
+
+    def get_jobs_by_user(self, user_id, status=None):
+        return self.shard_for(user_id).get_jobs_by_user(user_id, status)
+
+    def get_jobs_page(self, user_id, status=None, source=None, before_id=None, limit=50):
+        return self.shard_for(user_id).get_jobs_page(user_id, status, source, before_id, limit)
+
+    def get_jobs_by_ids(self, job_ids):
+        by_shard = {}
+        for job_id in job_ids:
+            by_shard.setdefault(self.slot_map[job_id % self.id_slots], []).append(job_id)
+        futures = [
+            self._executor.submit(self.shards[index].get_jobs_by_ids, ids)
+            for index, ids in by_shard.items()
+        ]
+        jobs = {}
+        for future in futures:
+            jobs.update(future.result())
+        return jobs
+
+    def add_skill_to_job(self, job_id, skill, required=False):
+        return self.shard_for(job_id).add_skill_to_job(job_id, skill, required)
+
+    def add_job_skills(self, job_id, skills):
+        return self.shard_for(job_id).add_job_skills(job_id, skills)
+
+    def get_job_skills(self, job_id):
+        return self.shard_for(job_id).get_job_skills(job_id)
+
+    def iter_export_chunks(self, user_id=None, chunk_size=10000, **filters):
+        """
+        As Database.iter_export_chunks. Without a user_id, the shards' chunk
+        streams are merged on job id, so rows still come out in id order.
+        """
+        if user_id is not None:
+            yield from self.shard_for(user_id).iter_export_chunks(user_id=user_id, chunk_size=chunk_size, **filters)
+            return
+        streams = [
+            itertools.chain.from_iterable(shard.iter_export_chunks(chunk_size=chunk_size, **filters))
+            for shard in self.shards
+        ]
+        chunk = []
+        for row in heapq.merge(*streams, key=lambda row: row[0]):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    # Status history and summaries
+
+    def get_status_events(self, after_id=0, limit=500, job_id=None):
+        if job_id is None:
+            raise ValueError("status events are read per shard; iterate over .shards")
+        return self.shard_for(job_id).get_status_events(after_id, limit, job_id)
+
+    def get_status_funnel(self, user_id):
+        return self.shard_for(user_id).get_status_funnel(user_id)
+
+    def get_skill_frequency(self, user_id, limit=20):
+        return self.shard_for(user_id).get_skill_frequency(user_id, limit)
+
+    def get_source_yield(self, user_id):
+        return self.shard_for(user_id).get_source_yield(user_id)
+
+    def rebuild_summaries(self):
+        return all(self._fan_out("rebuild_summaries"))
+
+    def get_overview(self):
+        totals = {"users": 0, "jobs": 0, "statuses": {}, "applied": 0, "responses": 0, "offers": 0, "pending_reminders": 0}
+        for overview in self._fan_out("get_overview"):
+            for key in ("users", "jobs", "applied", "responses", "offers", "pending_reminders"):
+                totals[key] += overview[key]
+            for status, count in overview["statuses"].items():
+                totals["statuses"][status] = totals["statuses"].get(status, 0) + count
+        totals["response_rate"] = round(totals["responses"] / totals["applied"], 4) if totals["applied"] else None
+        return totals
+
+    def get_meta(self, key, default=None):
+        raise ValueError("bookkeeping values are kept per shard; iterate over .shards")
+
+    def apply_follow_ups(self, reminders, cancel_job_ids, cursor_key, last_event_id):
+        raise ValueError("follow-ups are applied per shard; iterate over .shards")
+
+    # Reminders
+
+    def add_reminder(self, user_id, title, description=None, due_date=None, job_id=None):
+        return self.shard_for(user_id).add_reminder(user_id, title, description, due_date, job_id)
+
+    def get_pending_reminders(self, after=(-1, 0), until=None, limit=500):
+        """As Database.get_pending_reminders, merged across shards on (due_at, id)."""
+        merged = heapq.merge(
+            *self._fan_out("get_pending_reminders", after, until, limit),
+            key=lambda reminder: (reminder["due_at"], reminder["id"])
+        )
+        return list(itertools.islice(merged, limit))
+
+    def mark_reminder_notified(self, reminder_id, notified_at=None):
+        return self.shard_for(reminder_id).mark_reminder_notified(reminder_id, notified_at)
+
+    def complete_reminder(self, reminder_id):
+        return self.shard_for(reminder_id).complete_reminder(reminder_id)
+
+    # Searches
+
+    def log_search(self, user_id, *args, **kwargs):
+        return self.shard_for(user_id).log_search(user_id, *args, **kwargs)
+
+    def get_search_stats(self, since=None):
+        sites = {}
+        for rows in self._fan_out("get_search_stats", since):
+            for row in rows:
+                site = sites.setdefault(row["site"], {
+                    "searches": 0, "cache_hits": 0, "coalesced": 0, "crawl_ms": [0.0, 0], "hit_ms": [0.0, 0]
+                })
+                hits = row["cache_hits"] or 0
+                coalesced = row["coalesced"] or 0
+                site["searches"] += row["searches"]
+                site["cache_hits"] += hits
+                site["coalesced"] += coalesced
+                # Averages are recombined weighted by the number of crawls and hits
+                for key, average, count in (("crawl_ms", row["avg_crawl_ms"], row["searches"] - hits - coalesced),
+                                            ("hit_ms", row["avg_hit_ms"], hits)):
+                    if average is not None and count:
+                        site[key][0] += average * count
+                        site[key][1] += count
+        return [
+            {
+                "site": name,
+                "searches": site["searches"],
+                "cache_hits": site["cache_hits"],
+                "coalesced": site["coalesced"],
+                "hit_rate": (
+                    round(site["cache_hits"] / (site["searches"] - site["coalesced"]), 4)
+                    if site["searches"] > site["coalesced"] else None
+                ),
+                "avg_crawl_ms": site["crawl_ms"][0] / site["crawl_ms"][1] if site["crawl_ms"][1] else None,
+                "avg_hit_ms": site["hit_ms"][0] / site["hit_ms"][1] if site["hit_ms"][1] else None,
+            }
+            for name, site in sorted(sites.items())
+        ]
+
+    def _cache_shard(self, site, query_key, location_key):
+        # Cached results are shared by all users; spread them by key
+        return self.shards[user_hash(f"{site}\x1f{query_key}\x1f{location_key}") % len(self.shards)]
+
+    def get_cached_search(self, site, query_key, location_key, max_age):
+        return self._cache_shard(site, query_key, location_key).get_cached_search(site, query_key, location_key, max_age)
+
+    def store_cached_search(self, site, query_key, location_key, results, results_count):
+        return self._cache_shard(site, query_key, location_key).store_cached_search(
+            site, query_key, location_key, results, results_count
+        )
+
+
+def _slot_filter(column, slots, moving):
+    return f"({column} % {slots}) IN ({', '.join(str(slot) for slot in moving)})"
+
+
+def _copy_slots(source, destination, slots, moving):
+    """
+    Copy every row of the moving slots from one shard file to another in a
+    single transaction on the destination. Rows already there for those
+    slots (left by an interrupted run) are replaced.
+    """
+    conn = sqlite3.connect(destination, timeout=30.0)
+    try:
+        conn.execute("ATTACH DATABASE ? AS source", (source,))
+        copied = 0
+        for table, column in SHARDED_TABLES:
+            columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+            where = _slot_filter(column, slots, moving)
+            conn.execute(f"DELETE FROM main.{table} WHERE {where}")
+            cursor = conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM source.{table} WHERE {where}")
+            copied += cursor.rowcount
+        with metrics.span("db_commit_ms", method="rebalance"):
+            conn.commit()
+        return copied
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _delete_slots(path, slots, moving):
+    """Delete the rows of slots a shard no longer owns."""
+    conn = sqlite3.connect(path, timeout=30.0)
+    try:
+        for table, column in SHARDED_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE {_slot_filter(column, slots, moving)}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _finish_pending(db_path, manifest, directory):
+    """Delete rows left on source shards by a move whose manifest switch already happened."""
+    for index, moving in manifest.get("pending", []):
+        _delete_slots(os.path.join(directory, manifest["shards"][index]), manifest["slots"], moving)
+    manifest["pending"] = []
+    write_manifest(db_path, manifest)
+
+
+def _email_conflicts(directory, manifest, new_map):
+    """
+    Users that share an email and would end up on the same shard under
+    new_map, where that file's UNIQUE constraint would reject the copy.
+    Returns {email: [usernames]}.
+    """
+    slots = manifest["slots"]
+    placed = {}
+    for name in manifest["shards"]:
+        conn = sqlite3.connect(os.path.join(directory, name))
+        try:
+            for user_id, username, email in conn.execute("SELECT id, username, email FROM users"):
+                placed.setdefault((email, new_map[user_id % slots]), []).append(username)
+        finally:
+            conn.close()
+    return {email: sorted(usernames) for (email, _), usernames in placed.items() if len(usernames) > 1}
+
+
+def drain_follow_ups(database):
+    """Run the follow-up engine on every shard, so no status event is left unprocessed."""
+    from src.followup_rules import FollowUpEngine
+
+    return FollowUpEngine(database).run()
+
+
+def rebalance(db_path=DB_PATH, shards=DB_SHARDS):
+    """
+    Move slots between shard files so they are spread evenly over `shards`
+    shards, moving as few as possible. Shard files are created as needed;
+    files of removed shards are left empty on disk.
+
+    For each (source, destination) pair, the rows of its slots are copied in
+    one destination transaction, then the manifest is switched, then the
+    rows are deleted from the source. A run interrupted at any point can be
+    resumed by running it again. Writers must be stopped while it runs, and
+    the follow-up engine is drained first so no unhandled event moves.
+
+    Users sharing an email (possible in stores written before add_user
+    checked every shard, or by concurrent processes) cannot be placed on the
+    same shard; if the new slot map would do that, nothing is moved and a
+    ValueError names them, so one email can be changed and the run repeated.
+
+    Returns a summary of the moves.
+    """
+    manifest = load_manifest(db_path)
+    if manifest is None:
+        raise ValueError(f"no sharded store at {manifest_path(db_path)}")
+    database = ShardedDatabase(db_path, 0, shards=len(manifest["shards"]))
+    drain_follow_ups(database)
+    database.close()
+
+    directory = os.path.dirname(os.path.abspath(db_path))
+    _finish_pending(db_path, manifest, directory)
+    slots = manifest["slots"]
+    new_map = plan_slot_map(manifest["slot_map"], shards)
+    conflicts = _email_conflicts(directory, manifest, new_map)
+    if conflicts:
+        listed = "; ".join(f"{email}: {', '.join(usernames)}" for email, usernames in sorted(conflicts.items()))
+        raise ValueError(f"users share an email and would be placed on the same shard ({listed})")
+
+    while len(manifest["shards"]) < shards:
+        name = os.path.basename(shard_path(db_path, len(manifest["shards"])))
+        Database(os.path.join(directory, name), 0, shards=0, id_slots=slots).close()
+        manifest["shards"].append(name)
+    write_manifest(db_path, manifest)
+
+    moves = {}
+    for slot, (old, new) in enumerate(zip(manifest["slot_map"], new_map)):
+        if old != new:
+            moves.setdefault((old, new), []).append(slot)
+
+    summary = {"slots_moved": 0, "rows_copied": 0, "moves": []}
+    for (source, destination), moving in sorted(moves.items()):
+        with metrics.span("rebalance_move_ms"):
+            copied = _copy_slots(
+                os.path.join(directory, manifest["shards"][source]),
+                os.path.join(directory, manifest["shards"][destination]),
+                slots, moving
+            )
+            for slot in moving:
+                manifest["slot_map"][slot] = destination
+            manifest["pending"] = [[source, moving]]
+            write_manifest(db_path, manifest)
+            _finish_pending(db_path, manifest, directory)
+        logger.info(f"Moved {len(moving)} slots ({copied} rows) from shard {source} to shard {destination}")
+        summary["slots_moved"] += len(moving)
+        summary["rows_copied"] += copied
+        summary["moves"].append({"from": source, "to": destination, "slots": len(moving), "rows": copied})
+
+    manifest["shards"] = manifest["shards"][:shards]
+    write_manifest(db_path, manifest)
+    summary["shards"] = shards
+    return summary
+
+
+def shard_status(db_path=DB_PATH):
+    """Slots, users and jobs held by each shard."""
+    manifest = load_manifest(db_path)
+    if manifest is None:
+        return None
+    directory = os.path.dirname(os.path.abspath(db_path))
+    status = []
+    for index, name in enumerate(manifest["shards"]):
+        conn = sqlite3.connect(os.path.join(directory, name))
+        try:
+            users = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            jobs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        finally:
+            conn.close()
+        status.append({
+            "shard": index,
+            "file": name,
+            "slots": manifest["slot_map"].count(index),
+            "users": users,
+            "jobs": jobs,
+        })
+    return status
+
+
+def main(argv=None):
+    """Command-line tool: python -m src.sharding status | rebalance --shards N"""
+    parser = argparse.ArgumentParser(description="Inspect or rebalance the sharded job tracker store.")
+    parser.add_argument("--db", default=DB_PATH, help="DB_PATH the shards belong to (default: DB_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Show slots, users and jobs per shard")
+    rebalance_parser = commands.add_parser("rebalance", help="Spread slots over a new number of shards (stop writers first)")
+    rebalance_parser.add_argument("--shards", type=int, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "rebalance":
+        if load_manifest(args.db) is None:
+            print(f"No sharded store at {manifest_path(args.db)}")
+            return 1
+        print(json.dumps(rebalance(args.db, args.shards), indent=2))
+    else:
+        status = shard_status(args.db)
+        if status is None:
+            print(f"No sharded store at {manifest_path(args.db)}")
+            return 1
+        print(json.dumps(status, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1 +1,214 @@
- 
\ No newline at end of file
+import time
+
+import pandas as pd
+import streamlit as st
+
+from src.config import DB_PATH, DASHBOARD_PAGE_SIZE, DASHBOARD_CACHE_TTL, DASHBOARD_DB_POOL_SIZE, METRICS_ENABLED
+from src.database import Database
+from src.metrics import metrics
+
+# Order in which stages are shown in the funnel
+STATUS_ORDER = ["discovered", "applied", "interview", "interviewing", "offer", "accepted", "rejected"]
+
+JOB_COLUMNS = ["id", "title", "company", "location", "source", "status", "match_score", "applied_date", "created_at", "url"]
+
+
+@st.cache_resource
+def get_database():
+    """One Database per server process, with pooled connections reused across reruns."""
+    return Database(DB_PATH, pool_size=DASHBOARD_DB_POOL_SIZE)
+
+
+@st.cache_resource
+def start_metrics_server():
+    """Expose /metrics from the dashboard process once, when METRICS_ENABLED is set."""
+    if METRICS_ENABLED:
+        try:
+            return metrics.serve()
+        except OSError as e:
+            st.warning(f"Metrics server not started: {e}")
+    return None
+
+
+# The loaders below take the user's data version as an argument. Every write
+# for the user bumps the version, so the next rerun misses the cache and
+# reloads; unchanged users keep being served from memory.
+
+@st.cache_data(ttl=300, max_entries=1000)
+def _load_existing_user(username):
+    user = get_database().get_user_by_username(username)
+    if user is None:
+        # Raising keeps the miss out of the cache
+        raise LookupError(username)
+    return user
+
+
+def load_user(username):
+    """Look up a user; unknown names are not cached, so a user created later is found."""
+    try:
+        return _load_existing_user(username)
+    except LookupError:
+        return None
+
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, max_entries=1000)
+def load_funnel(user_id, version):
+    return get_database().get_status_funnel(user_id)
+
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, max_entries=1000)
+def load_skill_frequency(user_id, version, limit=20):
+    return get_database().get_skill_frequency(user_id, limit)
+
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, max_entries=1000)
+def load_source_yield(user_id, version):
+    return get_database().get_source_yield(user_id)
+
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, max_entries=5000)
+def load_jobs_page(user_id, version, status, source, before_id, limit):
+    # One extra row tells us whether there is a next page
+    jobs = get_database().get_jobs_page(user_id, status, source, before_id, limit + 1)
+    return [{column: job.get(column) for column in JOB_COLUMNS} for job in jobs]
+
+
+@st.cache_data(ttl=300)
+def load_search_stats():
+    return get_database().get_search_stats()
+
+
+def render_funnel(funnel):
+    stages = funnel["stages"]
+    total = sum(stage["current"] for stage in stages.values())
+    columns = st.columns(4)
+    columns[0].metric("Jobs", f"{total:,}")
+    columns[1].metric("Applied", f"{funnel['applied']:,}")
+    columns[2].metric("Responses", f"{funnel['responses']:,}")
+    rate = funnel["response_rate"]
+    columns[3].metric("Response rate", f"{rate:.0%}" if rate is not None else "-")
+
+    ordered = [status for status in STATUS_ORDER if status in stages]
+    ordered += sorted(status for status in stages if status not in STATUS_ORDER)
+    frame = pd.DataFrame(
+        [
+            {
+                "status": status,
+                "current": stages[status]["current"],
+                "entered": stages[status]["entered"],
+                "avg days in stage": stages[status]["avg_days_in_stage"],
+            }
+            for status in ordered
+        ]
+    )
+    st.subheader("Status funnel")
+    if frame.empty:
+        st.info("No jobs yet.")
+        return
+    left, right = st.columns([2, 3])
+    left.dataframe(frame, hide_index=True, use_container_width=True)
+    right.bar_chart(frame.set_index("status")["entered"])
+
+
+def render_skills(skills):
+    st.subheader("Most requested skills")
+    if not skills:
+        st.info("No skills extracted yet.")
+        return
+    frame = pd.DataFrame(skills).set_index("skill")
+    st.bar_chart(frame[["jobs", "required"]])
+
+
+def render_sources(sources):
+    st.subheader("Yield by source")
+    if not sources:
+        st.info("No jobs yet.")
+        return
+    st.dataframe(pd.DataFrame(sources), hide_index=True, use_container_width=True)
+
+
+def render_jobs(user_id, version, funnel, sources):
+    st.subheader("Jobs")
+    left, right = st.columns(2)
+    status = left.selectbox("Status", [""] + sorted(funnel["stages"]), format_func=lambda value: value or "All")
+    source = right.selectbox("Source", [""] + [row["source"] for row in sources], format_func=lambda value: value or "All")
+
+    # Keyset pagination: remember the cursor (last id) of every page visited
+    filters = (user_id, status, source)
+    if st.session_state.get("job_filters") != filters:
+        st.session_state.job_filters = filters
+        st.session_state.job_cursors = [None]
+    cursors = st.session_state.job_cursors
+
+    rows = load_jobs_page(user_id, version, status or None, source or None, cursors[-1], DASHBOARD_PAGE_SIZE)
+    has_next = len(rows) > DASHBOARD_PAGE_SIZE
+    rows = rows[:DASHBOARD_PAGE_SIZE]
+
+    # Totals come from the summaries rather than a COUNT(*) over jobs
+    total = None
+    if status and not source:
+        total = funnel["stages"][status]["current"]
+    elif source and not status:
+        total = next(row["jobs"] for row in sources if row["source"] == source)
+    elif not status and not source:
+        total = sum(stage["current"] for stage in funnel["stages"].values())
+
+    st.dataframe(pd.DataFrame(rows, columns=JOB_COLUMNS), hide_index=True, use_container_width=True)
+
+    def previous_page():
+        st.session_state.job_cursors.pop()
+
+    def next_page():
+        st.session_state.job_cursors.append(rows[-1]["id"])
+
+    nav = st.columns([1, 1, 4])
+    nav[0].button("Previous", on_click=previous_page, disabled=len(cursors) == 1)
+    nav[1].button("Next", on_click=next_page, disabled=not has_next)
+    page = len(cursors)
+    if total is not None:
+        pages = max(1, -(-total // DASHBOARD_PAGE_SIZE))
+        nav[2].caption(f"Page {page:,} of {pages:,} ({total:,} jobs)")
+    else:
+        nav[2].caption(f"Page {page:,}")
+
+
+def main():
+    start = time.perf_counter()
+    st.set_page_config(page_title="Job Tracker", layout="wide")
+    start_metrics_server()
+    st.title("Job Tracker")
+
+    username = st.sidebar.text_input("Username")
+    if not username:
+        st.info("Enter a username in the sidebar.")
+        return
+    user = load_user(username)
+    if user is None:
+        st.error(f"No user named {username}")
+        return
+
+    user_id = user["id"]
+    # A single primary-key lookup per rerun decides whether cached views are still current
+    version = get_database().get_data_version(user_id)
+    funnel = load_funnel(user_id, version)
+    sources = load_source_yield(user_id, version)
+
+    render_funnel(funnel)
+    left, right = st.columns(2)
+    with left:
+        render_skills(load_skill_frequency(user_id, version))
+    with right:
+        render_sources(sources)
+    render_jobs(user_id, version, funnel, sources)
+
+    with st.expander("Search cache statistics"):
+        stats = load_search_stats()
+        if stats:
+            st.dataframe(pd.DataFrame(stats), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No searches logged yet.")
+
+    st.sidebar.caption(f"Data version {version} - rendered in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+main()